@@ -1,8 +1,25 @@
 """
-Simple in-memory cache for user data to speed up authentication.
+Simple in-memory caches used to speed up authentication and dashboard reads.
+
+ResponseCache stores JSON-serializable endpoint responses keyed by
+namespace + params. It uses an in-process LRU/TTL store by default, or a
+Redis-compatible server when CACHE_BACKEND=redis (so all workers share
+entries and invalidations).
 """
+import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from time import monotonic
+from typing import Any, Dict, List, Optional
+from app.core.config import (
+    CACHE_BACKEND,
+    REDIS_URL,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    PRINCIPAL_CACHE_MAX_ENTRIES,
+)
 
 class UserCache:
     def __init__(self, ttl_minutes: int = 5):
@@ -33,5 +50,127 @@ class UserCache:
         self._cache = None
         self._cache_time = None
 
-# Global cache instance
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 5):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisCache:
+    """Same interface as TTLCache, backed by a Redis-compatible server. Values are stored as JSON."""
+
+    def __init__(self, url: str, ttl_seconds: float = 5, key_prefix: str = "kmt:"):
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+        self._client = redis.Redis.from_url(url)
+        self._client.ping()
+        self._ttl = ttl_seconds
+        self._prefix = key_prefix
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._prefix + key)
+        except Exception as e:
+            print(f"Cache get error: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        try:
+            self._client.set(self._prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            print(f"Cache set error: {e}")
+    
+    def delete(self, key: str):
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            print(f"Cache delete error: {e}")
+    
+    def delete_prefix(self, prefix: str):
+        try:
+            keys = list(self._client.scan_iter(match=f"{self._prefix}{prefix}*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            print(f"Cache delete error: {e}")
+    
+    def clear(self):
+        self.delete_prefix("")
+
+def create_cache_backend(ttl_seconds: float, max_entries: int):
+    """Build the backend selected by CACHE_BACKEND, falling back to in-process if Redis is unavailable."""
+    if CACHE_BACKEND == "redis":
+        try:
+            return RedisCache(REDIS_URL, ttl_seconds=ttl_seconds)
+        except Exception as e:
+            print(f"⚠️  Redis cache unavailable ({e}), using in-process cache")
+    return TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+# Response cache namespaces
+ANALYTICS = "analytics"
+PLANNING_OVERVIEW = "planning_overview"
+
+class ResponseCache:
+    """Caches endpoint responses per namespace and query params."""
+
+    def __init__(self, backend):
+        self._backend = backend
+    
+    @staticmethod
+    def _key(namespace: str, params: Dict[str, Any]) -> str:
+        return f"{namespace}:" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+    
+    def get(self, namespace: str, **params) -> Optional[Any]:
+        return self._backend.get(self._key(namespace, params))
+    
+    def set(self, value: Any, namespace: str, **params):
+        self._backend.set(self._key(namespace, params), value)
+    
+    def invalidate(self, *namespaces: str):
+        """Drop every cached response in the given namespaces."""
+        for namespace in namespaces:
+            self._backend.delete_prefix(f"{namespace}:")
+
+# Global cache instances
 user_cache = UserCache(ttl_minutes=5)
+response_cache = ResponseCache(create_cache_backend(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES))
+# Column snapshots of authenticated users keyed by username (token "sub").
+# Always in-process: it holds password hashes and must not leave the worker.
+principal_cache = TTLCache(max_entries=PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
@@ -26,3 +26,44 @@ for origin in default_origins:
     if origin not in CORS_ORIGINS:
         CORS_ORIGINS.append(origin)
 
+
+# Response cache for dashboard endpoints (/analytics, /planning/overview).
+# CACHE_BACKEND=memory keeps entries per process; CACHE_BACKEND=redis shares them.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "5"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+# Bounded thread pool for bcrypt hashing/verification (login, signup, password changes).
+# Requests beyond HASH_POOL_MAX_PENDING queued or running jobs are rejected with 503.
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_POOL_MAX_PENDING = int(os.getenv("HASH_POOL_MAX_PENDING", "64"))
+
+# Per-process cache of authenticated users keyed by token subject, so
+# get_current_user can skip the users query. Entries are dropped on user changes.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "1024"))
+
+# Work shifts for per-shift work-time reports, "label=HH:MM-HH:MM" comma separated.
+# A shift whose end is not after its start runs past midnight.
+SHIFTS = os.getenv("SHIFTS", "A=06:00-14:00,B=14:00-22:00,C=22:00-06:00")
+
+# Push channel for task/machine changes (GET /events/stream).
+# EVENTS_BACKEND=memory delivers within one process; EVENTS_BACKEND=redis relays
+# events through Redis pub/sub (REDIS_URL) so every worker's subscribers see them.
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory").lower()
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Response compression. Bodies under COMPRESSION_MINIMUM_SIZE bytes are sent as is.
+# Brotli is offered when brotli-asgi is installed, otherwise gzip only.
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESSLEVEL = int(os.getenv("GZIP_COMPRESSLEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Startup. Demo accounts (admin/operator/supervisor/planning with known passwords)
+# are created or reset on boot only when SEED_DEMO_USERS is set; an empty database
+# still gets the default admin. Boots slower than STARTUP_BUDGET_SECONDS log a warning
+# (0 disables the check); timings are served at GET /internal/startup.
+SEED_DEMO_USERS = os.getenv("SEED_DEMO_USERS", "false").lower() in ("1", "true", "yes")
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3"))
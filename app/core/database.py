@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -13,17 +14,146 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./workflow.db")
 if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Connection pool tuning (PostgreSQL). Size workers so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under the server's max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds; hosted Postgres drops idle connections
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 = no limit
+
+# SQLite tuning profile, applied to every new connection (SQLITE_PROFILE):
+#   default     - SQLite's own settings (rollback journal, synchronous=FULL)
+#   performance - WAL journal so readers never block the writer, synchronous=NORMAL,
+#                 a busy timeout instead of immediate "database is locked" errors,
+#                 a larger page cache, memory-mapped reads and in-memory temp tables
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default").lower()
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+SQLITE_PROFILES = {
+    "default": [],
+    "performance": [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ],
+}
+
 # Configure engine based on database type
 if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    if SQLITE_PROFILE not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE '{SQLITE_PROFILE}', expected one of {list(SQLITE_PROFILES)}")
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
     )
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PROFILES[SQLITE_PROFILE]:
+            cursor.execute(pragma)
+        cursor.close()
 else:
     # PostgreSQL configuration
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+# Cumulative pool counters for /internal/pool
+_pool_counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0, "saturated_checkouts": 0}
+_pool_counters_lock = threading.Lock()
+
+def _count(name: str):
+    with _pool_counters_lock:
+        _pool_counters[name] += 1
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _count("connects")
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _count("checkouts")
+    pool = engine.pool
+    if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+        # Every connection including overflow is in use: further requests will wait
+        if pool.checkedout() >= pool.size() + max(getattr(pool, "_max_overflow", 0), 0):
+            _count("saturated_checkouts")
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    _count("checkins")
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _count("invalidations")
+
+def get_pool_stats() -> dict:
+    """Current pool occupancy plus cumulative counters since process start."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    if "size" in stats:
+        stats["max_overflow"] = getattr(pool, "_max_overflow", None)
+        stats["timeout"] = getattr(pool, "_timeout", None)
+    with _pool_counters_lock:
+        stats.update(_pool_counters)
+    return stats
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Session hooks for list ETags (app.core.table_versions) and delta sync
+# (app.core.delta_sync). Registered here so every SessionLocal user, API and
+# maintenance scripts alike, keeps them up to date; the modules depend on the
+# models, so they are imported when a hook first runs.
+@event.listens_for(SessionLocal, "after_flush")
+def _after_flush(session, flush_context):
+    from app.core import delta_sync, table_versions
+    table_versions.record_flushed_tables(session)
+    delta_sync.record_synced_rows(session)
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    from app.core import table_versions
+    table_versions.record_statement_table(orm_execute_state)
+
+@event.listens_for(SessionLocal, "before_commit")
+def _before_commit(session):
+    from app.core import delta_sync, table_versions
+    session.flush()  # record ORM changes still pending
+    # Fixed lock order: table_versions rows first, the change counter row last
+    table_versions.bump_before_commit(session)
+    delta_sync.stamp_before_commit(session)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _after_commit(session):
+    from app.core import table_versions
+    table_versions.bump_after_commit(session)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _after_rollback(session):
+    from app.core import delta_sync, table_versions
+    table_versions.discard_tables(session)
+    delta_sync.discard_pending(session)
+
 Base = declarative_base()
 
 def get_db():
@@ -32,14 +162,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
-# Helper for direct connection (legacy support if needed, but prefer ORM)
-def get_db_connection():
-    if "sqlite" in SQLALCHEMY_DATABASE_URL:
-        import sqlite3
-        conn = sqlite3.connect("workflow.db")
-        conn.row_factory = sqlite3.Row
-        return conn
-    else:
-        # For PostgreSQL, we should rely on SQLAlchemy session
-        raise NotImplementedError("Direct connection not supported for PostgreSQL. Use get_db() session instead.")
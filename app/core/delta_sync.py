@@ -0,0 +1,185 @@
+"""
+Delta sync for tasks, subtasks and outsource items (GET /tasks/changes).
+
+Every write to a synced row stamps it with a change_seq taken from the "sync"
+row of change_counters; deletes leave a sync_tombstones row with a sequence
+too. Clients keep the highest sequence they have seen and ask for everything
+after it.
+
+Sequences are allocated at commit time: the session records which synced rows
+a transaction wrote or deleted, and a before_commit hook runs
+UPDATE change_counters SET value = value + n, stamps the rows and writes the
+tombstones just before COMMIT. The counter row is therefore the last lock a
+transaction takes and is held only for the commit itself, so sequence order
+still matches commit order (a client can never skip past a change that
+commits late) without serializing whole write transactions or deadlocking
+against locks taken earlier (task rows, project_stats). A transaction gets one
+sequence per SYNC_ROWS_PER_SEQ rows, which bounds the size of a page.
+
+ORM writes are recorded by an after_flush hook. Core bulk statements (insert(Task)
+with a list of rows, update(tasks)) bypass it and must call stamp_rows() or
+mark_changed() themselves. The hooks are registered in app.core.database, which
+runs them after the table version bump (app.core.table_versions).
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert, select, union_all, update
+from sqlalchemy.orm import Session
+from app.core import serializers
+from app.models.models_db import ChangeCounter, OutsourceItem, Subtask, SyncTombstone, Task
+
+SYNC_COUNTER = "sync"
+SYNCED_MODELS = (Task, Subtask, OutsourceItem)
+SYNC_ROWS_PER_SEQ = 500  # rows sharing one change_seq; a page can exceed `limit` by less than this
+_SESSION_KEY = "sync_pending"
+
+TASK_COLUMNS = serializers.TASK_COLUMNS + [Task.updated_at, Task.change_seq]
+SUBTASK_COLUMNS = [
+    Subtask.id, Subtask.task_id, Subtask.title, Subtask.status, Subtask.notes,
+    Subtask.created_at, Subtask.updated_at, Subtask.change_seq,
+]
+OUTSOURCE_COLUMNS = serializers.OUTSOURCE_COLUMNS + [OutsourceItem.change_seq]
+_SYNCED_TABLES = {model.__tablename__: model.__table__ for model in SYNCED_MODELS}
+
+def allocate_change_seqs(conn, count: int) -> int:
+    """Reserve `count` consecutive sequence numbers and return the first. Locks the counter row until commit."""
+    counters = ChangeCounter.__table__
+    result = conn.execute(
+        update(counters).where(counters.c.name == SYNC_COUNTER).values(value=counters.c.value + count)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(counters).values(name=SYNC_COUNTER, value=count))
+        return 1
+    last = conn.execute(select(counters.c.value).where(counters.c.name == SYNC_COUNTER)).scalar_one()
+    return last - count + 1
+
+def _pending(db: Session) -> dict:
+    return db.info.setdefault(_SESSION_KEY, {"changed": {}, "deleted": {}})
+
+def mark_changed(db: Session, model, ids: Iterable):
+    """Have rows written with a Core statement stamped when the transaction commits."""
+    changed = _pending(db)["changed"].setdefault(model.__tablename__, {})
+    for row_id in ids:
+        changed[row_id] = None
+
+def stamp_rows(db: Session, rows: List[dict], model=Task) -> List[dict]:
+    """Set updated_at on rows about to be written with a Core bulk insert and mark them for stamping."""
+    now = datetime.utcnow()
+    for row in rows:
+        row["updated_at"] = now
+    mark_changed(db, model, [row["id"] for row in rows])
+    return rows
+
+# ---------------------------------------------------------------------------
+# Session hooks
+# ---------------------------------------------------------------------------
+
+def record_synced_rows(session):
+    changed = [o for o in session.new if isinstance(o, SYNCED_MODELS)]
+    changed += [o for o in session.dirty if isinstance(o, SYNCED_MODELS) and session.is_modified(o)]
+    deleted = [o for o in session.deleted if isinstance(o, SYNCED_MODELS)]
+    if not changed and not deleted:
+        return
+    
+    pending = _pending(session)
+    for obj in changed:
+        pending["changed"].setdefault(obj.__tablename__, {})[obj.id] = None
+    now = datetime.utcnow()
+    for obj in deleted:
+        pending["changed"].get(obj.__tablename__, {}).pop(obj.id, None)
+        pending["deleted"][(obj.__tablename__, obj.id)] = now
+
+def stamp_before_commit(session):
+    """Stamp the rows and write the tombstones of this transaction. Call after the final flush."""
+    pending = session.info.pop(_SESSION_KEY, None)
+    if not pending:
+        return
+    changes = [("row", table, row_id) for table, ids in pending["changed"].items() for row_id in ids]
+    changes += [("tombstone", entity, entity_id) for entity, entity_id in pending["deleted"]]
+    if not changes:
+        return
+    
+    conn = session.connection()
+    chunks = [changes[i:i + SYNC_ROWS_PER_SEQ] for i in range(0, len(changes), SYNC_ROWS_PER_SEQ)]
+    seq = allocate_change_seqs(conn, len(chunks))
+    for chunk in chunks:
+        ids_by_table: Dict[str, list] = {}
+        tombstones = []
+        for kind, table, row_id in chunk:
+            if kind == "row":
+                ids_by_table.setdefault(table, []).append(row_id)
+            else:
+                tombstones.append({
+                    "entity": table, "entity_id": row_id, "change_seq": seq,
+                    "deleted_at": pending["deleted"][(table, row_id)],
+                })
+        for table, ids in ids_by_table.items():
+            synced = _SYNCED_TABLES[table]
+            conn.execute(update(synced).where(synced.c.id.in_(ids)).values(change_seq=seq))
+        if tombstones:
+            conn.execute(insert(SyncTombstone.__table__), tombstones)
+        seq += 1
+
+def discard_pending(session):
+    session.info.pop(_SESSION_KEY, None)
+
+# ---------------------------------------------------------------------------
+# Changes feed
+# ---------------------------------------------------------------------------
+
+_task_rows = serializers.RowSerializer(TASK_COLUMNS)
+_subtask_rows = serializers.RowSerializer(SUBTASK_COLUMNS)
+_outsource_rows = serializers.RowSerializer(OUTSOURCE_COLUMNS)
+
+def _rows(db: Session, serializer: serializers.RowSerializer, since: int, upper: Optional[int]) -> List[dict]:
+    seq_column = serializer.columns[-1]
+    stmt = select(*serializer.columns).where(seq_column > since)
+    if upper is not None:
+        stmt = stmt.where(seq_column <= upper)
+    return serializer.many(db.execute(stmt.order_by(seq_column)))
+
+def changes_since(db: Session, since: int, limit: int) -> dict:
+    """
+    Upserts and deletes with change_seq > since, oldest first. A page holds
+    about `limit` changes but never splits one sequence number across pages,
+    so it can be larger by up to SYNC_ROWS_PER_SEQ - 1.
+    """
+    seqs = union_all(
+        select(Task.change_seq.label("seq")).where(Task.change_seq > since),
+        select(Subtask.change_seq).where(Subtask.change_seq > since),
+        select(OutsourceItem.change_seq).where(OutsourceItem.change_seq > since),
+        select(SyncTombstone.change_seq).where(SyncTombstone.change_seq > since),
+    ).subquery()
+    
+    # Sequence of the limit-th change; None when fewer changes are pending
+    upper = db.execute(select(seqs.c.seq).order_by(seqs.c.seq).offset(limit - 1).limit(1)).scalar()
+    has_more = False
+    if upper is not None:
+        has_more = db.execute(select(seqs.c.seq).where(seqs.c.seq > upper).limit(1)).first() is not None
+    
+    tasks = _rows(db, _task_rows, since, upper)
+    subtasks = _rows(db, _subtask_rows, since, upper)
+    outsource_items = _rows(db, _outsource_rows, since, upper)
+    
+    deleted_query = db.query(SyncTombstone.entity, SyncTombstone.entity_id, SyncTombstone.change_seq).filter(
+        SyncTombstone.change_seq > since
+    )
+    if upper is not None:
+        deleted_query = deleted_query.filter(SyncTombstone.change_seq <= upper)
+    deleted = [
+        {"entity": entity, "id": entity_id, "change_seq": seq}
+        for entity, entity_id, seq in deleted_query.order_by(SyncTombstone.change_seq)
+    ]
+    
+    next_since = max(
+        [since] + [r["change_seq"] for r in tasks + subtasks + outsource_items] + [d["change_seq"] for d in deleted]
+    )
+    return {
+        "since": since,
+        "next_since": next_since,
+        "has_more": has_more,
+        "tasks": tasks,
+        "subtasks": subtasks,
+        "outsource_items": outsource_items,
+        "deleted": deleted,
+    }
@@ -1,8 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core.database import get_db
 from app.core.auth_utils import decode_access_token
+from app.core.cache import principal_cache
 from app.models.models_db import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -11,7 +13,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 # -------------------------
 # Base Authentication: Check JWT and return logged-in user
 # -------------------------
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
@@ -33,14 +35,28 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    cached = principal_cache.get(username)
+    if cached is not None:
+        # Rebuild the user from the cached columns and attach it to this
+        # request's session without a SELECT; changes to it still persist.
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
     user = db.query(User).filter(User.username == username).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    principal_cache.set(username, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
     return user
 
 
+def invalidate_principal(username: str):
+    """Forget the cached principal so the next request re-reads the user row."""
+    principal_cache.delete(username)
+
+
 # -------------------------
 # NEW FUNCTION (Fixes Render Error)
 # General active user check
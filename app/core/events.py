@@ -0,0 +1,187 @@
+"""
+Push channel for task and machine state changes, consumed by GET /events/stream.
+
+Handlers build compact event dicts (task_events(), machine_event()) before
+committing and hand them to event_broker.publish() afterwards. publish() is
+safe to call from the threadpool: each subscriber owns an asyncio.Queue on the
+event loop that opened the stream, and events are put on it with
+call_soon_threadsafe(). When nobody is subscribed, handlers skip building
+events entirely.
+
+A subscriber that falls more than EVENTS_QUEUE_SIZE events behind is sent a
+single "resync" event and should refetch its lists.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import EVENTS_BACKEND, EVENTS_QUEUE_SIZE, REDIS_URL
+
+TOPICS = ("task", "machine")
+# Summary events that carry no unit/user and go to every subscriber of the topic
+BROADCAST_TYPES = ("bulk_created",)
+REDIS_CHANNEL = "kmt:events"
+
+class Subscription:
+    def __init__(self, topics: Set[str], unit_id: Optional[str], user_id: Optional[str], queue_size: int):
+        self.topics = topics
+        self.unit_id = unit_id
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.lagged = False
+    
+    def matches(self, event: dict) -> bool:
+        if event["topic"] not in self.topics:
+            return False
+        if event["type"] in BROADCAST_TYPES:
+            return True
+        if self.unit_id is not None and event.get("unit_id") != self.unit_id:
+            return False
+        if self.user_id is not None and self.user_id not in (event.get("assigned_to"), event.get("current_operator")):
+            return False
+        return True
+    
+    def _put(self, event: dict):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+    
+    def deliver(self, event: dict):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # loop closed, the stream is going away
+
+class EventBroker:
+    def __init__(self, queue_size: int = 256, redis_url: Optional[str] = None):
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._queue_size = queue_size
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+        if redis_url:
+            import redis  # optional dependency, only needed for EVENTS_BACKEND=redis
+            self._redis = redis.Redis.from_url(redis_url)
+    
+    @property
+    def active(self) -> bool:
+        """Whether publishing can reach anyone (always true when relaying through Redis)."""
+        return self._redis is not None or bool(self._subscriptions)
+    
+    def subscribe(self, topics: Iterable[str], unit_id: Optional[str] = None, user_id: Optional[str] = None) -> Subscription:
+        """Must be called from the event loop that will read the subscription's queue."""
+        subscription = Subscription(set(topics), unit_id, user_id, self._queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if self._redis is not None and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="events-redis", daemon=True)
+                self._listener.start()
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    def publish(self, events: List[dict]):
+        if not events:
+            return
+        if self._redis is not None:
+            try:
+                self._redis.publish(REDIS_CHANNEL, json.dumps(events))
+            except Exception as e:
+                print(f"Event publish error: {e}")
+            return
+        self._dispatch(events)
+    
+    def _dispatch(self, events: List[dict]):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            for event in events:
+                if subscription.matches(event):
+                    subscription.deliver(event)
+    
+    def _listen(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(REDIS_CHANNEL)
+        for message in pubsub.listen():
+            try:
+                self._dispatch(json.loads(message["data"]))
+            except Exception as e:
+                print(f"Event relay error: {e}")
+    
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+def _create_broker() -> EventBroker:
+    if EVENTS_BACKEND == "redis":
+        try:
+            return EventBroker(EVENTS_QUEUE_SIZE, redis_url=REDIS_URL)
+        except Exception as e:
+            print(f"⚠️ Redis events unavailable ({e}), using in-process events")
+    return EventBroker(EVENTS_QUEUE_SIZE)
+
+event_broker = _create_broker()
+
+# ---------------------------------------------------------------------------
+# Event builders
+# ---------------------------------------------------------------------------
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+def task_events(db: Session, tasks: Iterable, event_type: str) -> List[dict]:
+    """
+    One event per task. Call before commit (attributes expire on commit).
+    unit_id is the unit of the task's machine, looked up with one query.
+    """
+    if not event_broker.active:
+        return []
+    from app.models.models_db import Machine
+    
+    tasks = list(tasks)
+    machine_ids = {t.machine_id for t in tasks if t.machine_id}
+    units: Dict[str, Optional[int]] = {}
+    if machine_ids:
+        units = dict(db.query(Machine.id, Machine.unit_id).filter(Machine.id.in_(machine_ids)).all())
+    ts = _now()
+    events = []
+    for t in tasks:
+        unit_id = units.get(t.machine_id)
+        events.append({
+            "topic": "task",
+            "type": event_type,
+            "id": t.id,
+            "status": t.status,
+            "project": t.project,
+            "assigned_to": t.assigned_to,
+            "machine_id": t.machine_id,
+            "unit_id": str(unit_id) if unit_id is not None else None,
+            "ts": ts,
+        })
+    return events
+
+def bulk_task_event(count: int) -> List[dict]:
+    """A single summary event for bulk creation/import; subscribers refetch."""
+    if not event_broker.active or not count:
+        return []
+    return [{"topic": "task", "type": "bulk_created", "count": count, "ts": _now()}]
+
+def machine_event(machine, event_type: str) -> List[dict]:
+    if not event_broker.active:
+        return []
+    return [{
+        "topic": "machine",
+        "type": event_type,
+        "id": machine.id,
+        "status": machine.status,
+        "current_operator": machine.current_operator,
+        "unit_id": str(machine.unit_id) if machine.unit_id is not None else None,
+        "ts": _now(),
+    }]
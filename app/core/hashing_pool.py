@@ -0,0 +1,93 @@
+"""
+Runs bcrypt hashing/verification on a dedicated, bounded thread pool.
+
+bcrypt costs 100-300 ms of CPU per call but releases the GIL, so running it on
+worker threads keeps the event loop free for other requests. The pool has a
+fixed number of workers and a cap on queued + running jobs; past the cap,
+callers get HashingPoolBusy (turned into a 503 by the app) instead of piling up.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.core.auth_utils import verify_password, hash_password
+from app.core.config import HASH_POOL_WORKERS, HASH_POOL_MAX_PENDING
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing pool already has max_pending jobs queued or running."""
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._workers = workers
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_pending_seen": 0,
+            "total_wait_seconds": 0.0,
+            "total_run_seconds": 0.0,
+        }
+    
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._stats["rejected"] += 1
+                raise HashingPoolBusy("Password hashing pool is saturated")
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_pending_seen"] = max(self._stats["max_pending_seen"], self._pending)
+        
+        enqueued_at = time.perf_counter()
+        
+        def job():
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._stats["total_wait_seconds"] += started_at - enqueued_at
+                    self._stats["total_run_seconds"] += finished_at - started_at
+        
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+        
+        with self._lock:
+            self._stats["completed"] += 1
+        return result
+    
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+        finished = stats["completed"] + stats["failed"]
+        return {
+            "workers": self._workers,
+            "max_pending": self._max_pending,
+            "pending": pending,
+            **stats,
+            "avg_wait_ms": round(stats["total_wait_seconds"] / finished * 1000, 2) if finished else 0.0,
+            "avg_run_ms": round(stats["total_run_seconds"] / finished * 1000, 2) if finished else 0.0,
+        }
+
+hashing_pool = HashingPool(workers=HASH_POOL_WORKERS, max_pending=HASH_POOL_MAX_PENDING)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() on the hashing pool."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the hashing pool."""
+    return await hashing_pool.run(hash_password, password)
@@ -0,0 +1,130 @@
+"""
+Machine utilization and cost over a date range, computed from task_work_intervals.
+
+Intervals touching the range (plus holds still running at its start) are
+loaded in bulk and clipped/summed with pandas column operations instead of a
+per-row loop; the end of a hold is the start of the task's next interval.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from sqlalchemy import String, exists, or_, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+from app.models.models_db import Machine, TaskWorkInterval
+
+def _interval_frame(db: Session, range_start: datetime, range_end: datetime, machine_ids: Optional[List[str]]):
+    import pandas as pd
+    
+    iv = TaskWorkInterval.__table__.c
+    # Timestamps are fetched without per-row conversion (SQLite returns ISO strings)
+    # and parsed column-wise by pandas below
+    columns = [
+        iv.task_id,
+        iv.machine_id,
+        type_coerce(iv.start_at, String),
+        type_coerce(iv.end_at, String),
+        iv.end_action,
+    ]
+    scope = [iv.machine_id != None, iv.start_at < range_end]
+    if machine_ids is not None:
+        scope.append(iv.machine_id.in_(machine_ids))
+    
+    # 1. Intervals overlapping the range
+    overlapping = select(*columns).where(*scope, or_(iv.end_at == None, iv.end_at > range_start))
+    
+    # 2. Holds that began before the range and were not resumed before it started
+    later = TaskWorkInterval.__table__.alias("later")
+    running_holds = select(*columns).where(
+        *scope,
+        iv.end_at <= range_start,
+        iv.end_action == "hold",
+        ~exists().where(
+            later.c.task_id == iv.task_id,
+            later.c.start_at > iv.start_at,
+            later.c.start_at <= range_start,
+        ),
+    )
+    
+    rows = db.execute(union_all(overlapping, running_holds)).all()
+    df = pd.DataFrame(rows, columns=["task_id", "machine_id", "start_at", "end_at", "end_action"])
+    for column in ("start_at", "end_at"):
+        df[column] = pd.to_datetime(df[column], format="ISO8601")
+    
+    # A hold lasts until the task's next interval; any later interval that starts
+    # inside the range is in the frame, otherwise the hold runs past its end
+    df = df.sort_values(["task_id", "start_at"], kind="stable")
+    df["next_start"] = df.groupby("task_id")["start_at"].shift(-1)
+    return df
+
+def machine_utilization(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    machine_id: Optional[str] = None,
+    unit_id: Optional[int] = None,
+) -> dict:
+    """
+    Busy, hold and idle hours plus cost (busy hours x hourly_rate) per machine
+    for [date_from, date_to] in UTC. Hours after now are not counted.
+    """
+    import pandas as pd
+    
+    range_start = datetime.combine(date_from, time.min)
+    range_end = datetime.combine(date_to + timedelta(days=1), time.min)
+    now = datetime.utcnow()
+    effective_end = min(range_end, now)
+    window_hours = max(0.0, (effective_end - range_start).total_seconds() / 3600)
+    
+    machines_query = db.query(Machine.id, Machine.name, Machine.hourly_rate)
+    if machine_id:
+        machines_query = machines_query.filter(Machine.id == machine_id)
+    if unit_id is not None:
+        machines_query = machines_query.filter(Machine.unit_id == unit_id)
+    machines = machines_query.order_by(Machine.name).all()
+    machine_ids = [m.id for m in machines] if (machine_id or unit_id is not None) else None
+    
+    busy = hold = pd.Series(dtype=float)
+    if window_hours > 0 and machines:
+        df = _interval_frame(db, range_start, effective_end, machine_ids)
+        if not df.empty:
+            lo = pd.Timestamp(range_start)
+            hi = pd.Timestamp(effective_end)
+            
+            # Active time: each interval clipped to the range; running ones count up to now
+            work_end = df["end_at"].fillna(hi).clip(upper=hi)
+            busy_seconds = (work_end - df["start_at"].clip(lower=lo)).dt.total_seconds().clip(lower=0)
+            
+            # Hold time: from a hold until the task's next interval (or now if still on hold)
+            hold_end = df["next_start"].fillna(hi).clip(upper=hi)
+            hold_seconds = (hold_end - df["end_at"].clip(lower=lo)).dt.total_seconds().clip(lower=0)
+            hold_seconds = hold_seconds.where(df["end_action"] == "hold", 0.0)
+            
+            totals = pd.DataFrame({
+                "machine_id": df["machine_id"],
+                "busy": busy_seconds / 3600,
+                "hold": hold_seconds / 3600,
+            }).groupby("machine_id").sum()
+            busy, hold = totals["busy"], totals["hold"]
+    
+    result = []
+    for m in machines:
+        busy_hours = float(busy.get(m.id, 0.0))
+        hold_hours = float(hold.get(m.id, 0.0))
+        rate = m.hourly_rate or 0.0
+        result.append({
+            "machine_id": m.id,
+            "name": m.name,
+            "hourly_rate": m.hourly_rate,
+            "busy_hours": round(busy_hours, 2),
+            "hold_hours": round(hold_hours, 2),
+            "idle_hours": round(max(0.0, window_hours - busy_hours - hold_hours), 2),
+            "utilization_pct": round(100 * busy_hours / window_hours, 1) if window_hours else 0.0,
+            "cost": round(busy_hours * rate, 2),
+        })
+    
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "window_hours": round(window_hours, 2),
+        "total_cost": round(sum(r["cost"] for r in result), 2),
+        "machines": result,
+    }
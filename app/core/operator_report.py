@@ -0,0 +1,108 @@
+"""
+Per-operator productivity over a date range, computed with grouped SQL aggregates.
+
+Each figure is one GROUP BY tasks.assigned_to query, so the work happens in the
+database and the cost grows with the rows in the range rather than with the
+whole history:
+- completed tasks and average cycle time (first start -> completion), from tasks
+  completed in the range (ix_tasks_status_completed_at), with the start taken
+  from task_time_logs (ix_task_time_logs_task_id_timestamp);
+- hold count, from hold logs in the range (ix_task_time_logs_action_timestamp);
+- active seconds, from task_work_intervals clipped to the range.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict
+from sqlalchemy import DateTime, case, func, literal, or_
+from sqlalchemy.orm import Session
+from app.models.models_db import Task, TaskTimeLog, TaskWorkInterval, User
+
+def _epoch_seconds(expr, dialect_name: str):
+    """Seconds since 1970 for a datetime expression, as a float."""
+    if dialect_name == "postgresql":
+        return func.extract("epoch", expr)
+    # SQLite stores ISO strings; julianday() parses them and keeps fractional seconds
+    return (func.julianday(expr) - 2440587.5) * 86400.0
+
+def operator_productivity(db: Session, date_from: date, date_to: date) -> dict:
+    range_start = datetime.combine(date_from, time.min)
+    range_end = datetime.combine(date_to + timedelta(days=1), time.min)
+    now = datetime.utcnow()
+    dialect = db.get_bind().dialect.name
+    epoch = lambda expr: _epoch_seconds(expr, dialect)
+    
+    # 1. Completed tasks and average cycle time
+    first_start = db.query(func.min(TaskTimeLog.timestamp)).filter(
+        TaskTimeLog.task_id == Task.id,
+        TaskTimeLog.action == "start",
+    ).correlate(Task).scalar_subquery()
+    completed_rows = db.query(
+        Task.assigned_to,
+        func.count(Task.id),
+        func.avg(epoch(Task.completed_at) - epoch(first_start)),
+    ).filter(
+        Task.completed_at >= range_start,
+        Task.completed_at < range_end,
+        Task.status == "completed",
+        Task.assigned_to != None,
+    ).group_by(Task.assigned_to).all()
+    
+    # 2. Holds placed in the range
+    hold_rows = db.query(
+        Task.assigned_to,
+        func.count(TaskTimeLog.id),
+    ).join(Task, Task.id == TaskTimeLog.task_id).filter(
+        TaskTimeLog.action == "hold",
+        TaskTimeLog.timestamp >= range_start,
+        TaskTimeLog.timestamp < range_end,
+        Task.assigned_to != None,
+    ).group_by(Task.assigned_to).all()
+    
+    # 3. Active seconds: work intervals clipped to the range (running ones up to now)
+    lo = literal(range_start, DateTime)
+    hi = literal(min(range_end, now), DateTime)
+    interval_end = func.coalesce(TaskWorkInterval.end_at, literal(now, DateTime))
+    clipped_start = case((TaskWorkInterval.start_at > lo, TaskWorkInterval.start_at), else_=lo)
+    clipped_end = case((interval_end < hi, interval_end), else_=hi)
+    active_rows = db.query(
+        Task.assigned_to,
+        func.sum(epoch(clipped_end) - epoch(clipped_start)),
+    ).join(Task, Task.id == TaskWorkInterval.task_id).filter(
+        TaskWorkInterval.start_at < hi,
+        or_(TaskWorkInterval.end_at == None, TaskWorkInterval.end_at > lo),
+        Task.assigned_to != None,
+    ).group_by(Task.assigned_to).all()
+    
+    stats: Dict[str, dict] = {}
+    def entry(user_id):
+        return stats.setdefault(user_id, {
+            "completed_tasks": 0,
+            "active_seconds": 0,
+            "hold_count": 0,
+            "avg_cycle_seconds": None,
+        })
+    for user_id, count, avg_cycle in completed_rows:
+        entry(user_id)["completed_tasks"] = count
+        entry(user_id)["avg_cycle_seconds"] = int(avg_cycle) if avg_cycle is not None else None
+    for user_id, count in hold_rows:
+        entry(user_id)["hold_count"] = count
+    for user_id, seconds in active_rows:
+        entry(user_id)["active_seconds"] = max(0, int(seconds or 0))
+    
+    # Every operator is listed, plus anyone else who had tasks in the range
+    users = db.query(User.user_id, User.username, User.full_name).filter(
+        or_(User.role == "operator", User.user_id.in_(list(stats)))
+    ).all()
+    operators = []
+    for user_id, username, full_name in users:
+        operators.append({"user_id": user_id, "username": username, "full_name": full_name, **entry(user_id)})
+    known = {u.user_id for u in users}
+    for user_id in stats:
+        if user_id not in known:
+            operators.append({"user_id": user_id, "username": None, "full_name": None, **stats[user_id]})
+    operators.sort(key=lambda o: (-o["completed_tasks"], o["username"] or o["user_id"]))
+    
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "operators": operators,
+    }
@@ -0,0 +1,143 @@
+"""
+Incrementally maintained per-project task rollup (the project_stats table).
+
+Task handlers call these helpers in the same transaction as the task write, so
+the rollup commits or rolls back together with it. rebuild_project_stats()
+recomputes everything from the tasks table to repair drift;
+migrate_add_project_stats.py runs it once to backfill existing databases.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from sqlalchemy import case, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.models_db import ProjectStats, Task
+
+# Task status -> counter column on ProjectStats ("pending" is total minus the rest)
+STATUS_COLUMNS = {
+    "completed": "completed_tasks",
+    "in_progress": "in_progress_tasks",
+    "on_hold": "on_hold_tasks",
+    "denied": "denied_tasks",
+}
+
+def _aggregate_query(db: Session):
+    return db.query(
+        Task.project,
+        func.count(Task.id),
+        func.sum(case((Task.status == "completed", 1), else_=0)),
+        func.sum(case((Task.status == "in_progress", 1), else_=0)),
+        func.sum(case((Task.status == "on_hold", 1), else_=0)),
+        func.sum(case((Task.status == "denied", 1), else_=0)),
+        func.sum(func.coalesce(Task.total_duration_seconds, 0)),
+    ).filter(Task.project != None).group_by(Task.project)
+
+def _row_values(row) -> dict:
+    project, total, completed, in_progress, on_hold, denied, duration = row
+    return {
+        "project": project,
+        "total_tasks": total or 0,
+        "completed_tasks": completed or 0,
+        "in_progress_tasks": in_progress or 0,
+        "on_hold_tasks": on_hold or 0,
+        "denied_tasks": denied or 0,
+        "total_duration_seconds": duration or 0,
+        "updated_at": datetime.utcnow(),
+    }
+
+def _create_project_row(db: Session, project: str) -> bool:
+    """
+    Insert the project's row computed from the tasks table (including this
+    transaction's flushed writes). Returns False if a concurrent transaction
+    created the row first; ON CONFLICT DO NOTHING waits for it to commit
+    instead of failing on the primary key.
+    """
+    db.flush()
+    row = _aggregate_query(db).filter(Task.project == project).first()
+    if not row:
+        return True
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    result = db.execute(
+        dialect_insert(ProjectStats).values(**_row_values(row)).on_conflict_do_nothing(index_elements=["project"])
+    )
+    return result.rowcount == 1
+
+def apply_delta(
+    db: Session,
+    project: Optional[str],
+    status_deltas: Optional[Dict[str, int]] = None,
+    total_delta: int = 0,
+    duration_delta: int = 0,
+):
+    """
+    Add deltas to one project's counters. Does not commit.
+    If the project has no rollup row yet, it is computed from the tasks table instead.
+    """
+    if not project:
+        return
+    
+    values = {}
+    if total_delta:
+        values["total_tasks"] = ProjectStats.total_tasks + total_delta
+    if duration_delta:
+        values["total_duration_seconds"] = ProjectStats.total_duration_seconds + duration_delta
+    for status, delta in (status_deltas or {}).items():
+        column = STATUS_COLUMNS.get(status)
+        if column and delta:
+            values[column] = values.get(column, getattr(ProjectStats, column)) + delta
+    if not values:
+        return
+    values["updated_at"] = datetime.utcnow()
+    
+    stmt = update(ProjectStats).where(ProjectStats.project == project).values(**values)
+    if db.execute(stmt).rowcount == 0 and not _create_project_row(db, project):
+        # Another transaction created the row (without our change) meanwhile
+        db.execute(stmt)
+
+def task_added(db: Session, task: Task):
+    apply_delta(
+        db, task.project,
+        status_deltas={task.status: 1},
+        total_delta=1,
+        duration_delta=task.total_duration_seconds or 0,
+    )
+
+def tasks_added_bulk(db: Session, rows: Iterable[dict]):
+    """task_added() for rows inserted with a Core insert, one UPDATE per project."""
+    per_project: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        if row.get("project"):
+            counts = per_project.setdefault(row["project"], {})
+            counts[row.get("status")] = counts.get(row.get("status"), 0) + 1
+    # Fixed (sorted) row order so concurrent bulk writes can't deadlock on PostgreSQL
+    for project, status_deltas in sorted(per_project.items()):
+        apply_delta(
+            db, project,
+            status_deltas=status_deltas,
+            total_delta=sum(status_deltas.values()),
+        )
+
+def task_removed(db: Session, task: Task):
+    apply_delta(
+        db, task.project,
+        status_deltas={task.status: -1},
+        total_delta=-1,
+        duration_delta=-(task.total_duration_seconds or 0),
+    )
+
+def task_transitioned(db: Session, task: Task, old_status: str, duration_delta: int = 0):
+    status_deltas = {old_status: -1}
+    status_deltas[task.status] = status_deltas.get(task.status, 0) + 1
+    apply_delta(
+        db, task.project,
+        status_deltas=status_deltas,
+        duration_delta=duration_delta,
+    )
+
+def rebuild_project_stats(db: Session) -> int:
+    """Recompute the whole rollup from the tasks table and commit. Returns the project count."""
+    db.query(ProjectStats).delete(synchronize_session=False)
+    rows = _aggregate_query(db).all()
+    db.add_all([ProjectStats(**_row_values(row)) for row in rows])
+    db.commit()
+    return len(rows)
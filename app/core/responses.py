@@ -0,0 +1,36 @@
+"""
+Fast JSON responses for large list payloads.
+
+Returning FastJSONResponse from a handler skips FastAPI's response_model
+validation and encodes with orjson when it is installed (the standard library
+json module otherwise). Content must already be JSON-ready, e.g. rows from
+app.core.serializers.
+"""
+import json
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def json_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    Wrap content in a FastJSONResponse, keeping headers a handler already set
+    on its injected `response` (e.g. ETag from conditional_get).
+    """
+    result = FastJSONResponse(content)
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
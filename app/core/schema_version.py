@@ -0,0 +1,50 @@
+"""
+Skip schema DDL on boot when the database already matches the models.
+
+The fingerprint is a hash of the CREATE TABLE / CREATE INDEX statements the
+models compile to for the engine's dialect. create_all runs only when it
+differs from the one stored in schema_version, i.e. on the first boot of a
+new database or after a model change; otherwise startup costs one query
+instead of a has_table round trip per table.
+
+Like create_all itself this only adds missing tables and indexes; column
+changes on existing tables still need a migrate_* script. Deleting the
+schema_version row forces the next boot to run create_all again.
+"""
+import hashlib
+from datetime import datetime
+from sqlalchemy import select, update, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.core.database import Base
+from app.models.models_db import SchemaVersion
+
+def schema_fingerprint(metadata, dialect) -> str:
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode("utf-8"))
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode("utf-8"))
+    return digest.hexdigest()
+
+def ensure_schema(engine: Engine) -> bool:
+    """Run create_all if the stored fingerprint is missing or stale. Returns True if DDL ran."""
+    fingerprint = schema_fingerprint(Base.metadata, engine.dialect)
+    with engine.connect() as conn:
+        try:
+            current = conn.execute(select(SchemaVersion.metadata_hash).where(SchemaVersion.id == 1)).scalar()
+        except (OperationalError, ProgrammingError):
+            current = None  # schema_version not created yet
+    if current == fingerprint:
+        return False
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(SchemaVersion).where(SchemaVersion.id == 1)
+            .values(metadata_hash=fingerprint, applied_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(SchemaVersion).values(id=1, metadata_hash=fingerprint))
+    return True
@@ -0,0 +1,55 @@
+"""
+Row serializers for list endpoints, delta sync and exports.
+
+A RowSerializer is built once per column list. It turns the rows of
+select(*columns) / db.query(*columns) into JSON-ready dicts without loading
+ORM objects: keys are taken from the columns up front and DateTime values are
+rendered as ISO 8601 strings, so the output is the same whichever JSON
+encoder sends it.
+"""
+from typing import Iterable, List
+from sqlalchemy import DateTime
+from app.models.models_db import Machine, OutsourceItem, PlanningTask, Task
+
+class RowSerializer:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.keys = [c.key for c in self.columns]
+        self._datetime_keys = [c.key for c in self.columns if isinstance(c.type, DateTime)]
+
+    def __call__(self, row) -> dict:
+        data = dict(zip(self.keys, row))
+        for key in self._datetime_keys:
+            value = data[key]
+            if value is not None:
+                data[key] = value.isoformat()
+        return data
+
+    def many(self, rows: Iterable) -> List[dict]:
+        return [self(row) for row in rows]
+
+TASK_COLUMNS = [
+    Task.id, Task.title, Task.description, Task.project, Task.part_item, Task.nos_unit,
+    Task.status, Task.priority, Task.assigned_by, Task.assigned_to, Task.machine_id,
+    Task.due_date, Task.created_at, Task.started_at, Task.completed_at,
+    Task.total_duration_seconds, Task.hold_reason, Task.denial_reason,
+]
+MACHINE_COLUMNS = [
+    Machine.id, Machine.name, Machine.status, Machine.hourly_rate, Machine.last_maintenance,
+    Machine.current_operator, Machine.updated_at, Machine.category_id, Machine.unit_id,
+]
+OUTSOURCE_COLUMNS = [
+    OutsourceItem.id, OutsourceItem.task_id, OutsourceItem.title, OutsourceItem.vendor,
+    OutsourceItem.status, OutsourceItem.cost, OutsourceItem.expected_date, OutsourceItem.dc_generated,
+    OutsourceItem.transport_status, OutsourceItem.follow_up_time, OutsourceItem.pickup_status,
+    OutsourceItem.updated_at,
+]
+PLANNING_TASK_COLUMNS = [
+    PlanningTask.id, PlanningTask.task_id, PlanningTask.project_name, PlanningTask.task_sequence,
+    PlanningTask.assigned_supervisor, PlanningTask.status, PlanningTask.updated_at,
+]
+
+task_serializer = RowSerializer(TASK_COLUMNS)
+machine_serializer = RowSerializer(MACHINE_COLUMNS)
+outsource_serializer = RowSerializer(OUTSOURCE_COLUMNS)
+planning_task_serializer = RowSerializer(PLANNING_TASK_COLUMNS)
@@ -0,0 +1,57 @@
+"""
+Cold-start timing report (GET /internal/startup).
+
+startup_report is created when app.main starts importing, so "imports" covers
+loading the app and its routers; the startup hook adds its own phases and
+calls finish(). Totals over STARTUP_BUDGET_SECONDS are logged as a warning.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+from app.core.config import STARTUP_BUDGET_SECONDS
+
+class StartupReport:
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.schema_changed: Optional[bool] = None
+        self.demo_users_seeded = False
+        self.total_seconds: Optional[float] = None
+        self.completed_at: Optional[datetime] = None
+
+    def mark(self, name: str):
+        """Record the time since app.main started importing, e.g. when the startup hook begins."""
+        self.phases[name] = round(time.perf_counter() - self._origin, 4)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - start, 4)
+
+    def finish(self) -> bool:
+        """Stop the clock; returns False if the budget was exceeded."""
+        self.total_seconds = round(time.perf_counter() - self._origin, 4)
+        self.completed_at = datetime.utcnow()
+        return self.within_budget()
+
+    def within_budget(self) -> Optional[bool]:
+        if self.total_seconds is None or STARTUP_BUDGET_SECONDS <= 0:
+            return None
+        return self.total_seconds <= STARTUP_BUDGET_SECONDS
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": dict(self.phases),
+            "total_seconds": self.total_seconds,
+            "budget_seconds": STARTUP_BUDGET_SECONDS or None,
+            "within_budget": self.within_budget(),
+            "schema_changed": self.schema_changed,
+            "demo_users_seeded": self.demo_users_seeded,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
+startup_report = StartupReport()
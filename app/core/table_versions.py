@@ -0,0 +1,162 @@
+"""
+Per-table change versions and strong ETags for list endpoints.
+
+Every SessionLocal session records which tables it wrote (ORM flushes plus
+insert/update/delete statements run through Session.execute) and bumps their
+versions when the transaction commits. A list endpoint's ETag is a hash of the
+versions of the tables it reads plus its query string, so a client sending a
+matching If-None-Match gets a 304 before any query or serialization runs.
+
+Versions live in the table_versions table by default and are bumped just
+before COMMIT on the session's own connection, so a version commits (or rolls
+back) together with the write it describes and every worker sees it; a bump
+that fails fails the commit. Rows are upserted in sorted name order, before
+delta sync takes its counter row, so concurrent writers lock them in one
+order. CACHE_BACKEND=redis keeps versions in Redis instead, bumped after the
+commit. Per-process counters are not an option: with several workers, one that
+did not handle a write would keep answering 304 to clients holding an outdated
+ETag.
+
+The session hooks are registered in app.core.database, next to SessionLocal,
+so maintenance scripts bump versions as well as the API.
+"""
+import hashlib
+from itertools import chain
+from typing import Iterable, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.config import CACHE_BACKEND, REDIS_URL
+from app.core.database import engine
+from app.models.models_db import TableVersion
+
+_SESSION_KEY = "changed_tables"
+
+class DatabaseVersionStore:
+    in_transaction = True
+    
+    def __init__(self, bind):
+        self._engine = bind
+        self._insert = postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+        self.token = "db"
+    
+    def get_many(self, tables: Iterable[str]) -> Optional[List[int]]:
+        tables = list(tables)
+        try:
+            with self._engine.connect() as conn:
+                versions = dict(conn.execute(
+                    select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(tables))
+                ).all())
+        except Exception as e:
+            print(f"Table version read error: {e}")
+            return None
+        return [versions.get(t, 0) for t in tables]
+    
+    def bump(self, tables: Iterable[str], conn):
+        """Upsert each table's version on the writing transaction's connection, in sorted order."""
+        for t in sorted(tables):
+            stmt = self._insert(TableVersion).values(name=t, version=1)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["name"], set_={"version": TableVersion.version + 1}
+            ))
+
+class RedisVersionStore:
+    in_transaction = False
+    
+    def __init__(self, url: str, key_prefix: str = "kmt:table_version:"):
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+        self._client = redis.Redis.from_url(url)
+        self._client.ping()
+        self._prefix = key_prefix
+        self.token = "redis"
+    
+    def get_many(self, tables: Iterable[str]) -> Optional[List[int]]:
+        try:
+            return [int(v or 0) for v in self._client.mget([self._prefix + t for t in tables])]
+        except Exception as e:
+            print(f"Table version read error: {e}")
+            return None
+    
+    def bump(self, tables: Iterable[str], conn=None):
+        try:
+            pipe = self._client.pipeline()
+            for t in tables:
+                pipe.incr(self._prefix + t)
+            pipe.execute()
+        except Exception as e:
+            print(f"Table version bump error: {e}")
+
+def _create_store():
+    if CACHE_BACKEND == "redis":
+        try:
+            return RedisVersionStore(REDIS_URL)
+        except Exception as e:
+            print(f"⚠️  Redis table versions unavailable ({e}), using the table_versions table")
+    return DatabaseVersionStore(engine)
+
+version_store = _create_store()
+
+# ---------------------------------------------------------------------------
+# Session hooks
+# ---------------------------------------------------------------------------
+
+def record_flushed_tables(session):
+    tables = session.info.setdefault(_SESSION_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.update(t.name for t in inspect(obj).mapper.tables)
+
+def record_statement_table(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            orm_execute_state.session.info.setdefault(_SESSION_KEY, set()).add(table.name)
+
+def bump_before_commit(session):
+    """Bump the tables written in this transaction inside it (table_versions store). Call after the final flush."""
+    if not version_store.in_transaction:
+        return
+    tables = session.info.pop(_SESSION_KEY, None)
+    if tables:
+        version_store.bump(tables, session.connection())
+
+def bump_after_commit(session):
+    """Bump the tables written by the committed transaction (Redis store)."""
+    tables = session.info.pop(_SESSION_KEY, None)
+    if tables:
+        version_store.bump(sorted(tables))
+
+def discard_tables(session):
+    session.info.pop(_SESSION_KEY, None)
+
+# ---------------------------------------------------------------------------
+# Conditional GET
+# ---------------------------------------------------------------------------
+
+def compute_etag(request: Request, tables: List[str]) -> Optional[str]:
+    versions = version_store.get_many(tables)
+    if versions is None:
+        return None
+    raw = "|".join(f"{t}={v}" for t, v in zip(tables, versions))
+    raw = f"{version_store.token}|{request.url.path}?{request.url.query}|{raw}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+def conditional_get(request: Request, response: Response, *tables: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client's If-None-Match is still current,
+    otherwise set ETag on `response` and return None. Call before querying:
+    a write racing the query can only make the tag older than the data.
+    """
+    etag = compute_etag(request, list(tables))
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
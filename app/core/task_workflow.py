@@ -0,0 +1,70 @@
+"""
+Task state machine shared by the single-task workflow endpoints and the batch
+transition endpoint, so both apply exactly the same rules.
+
+apply_transition() only mutates the Task and returns the TaskTimeLog row to
+write; callers decide how to insert the log, update project_stats and commit.
+"""
+import uuid
+from datetime import datetime
+from typing import NamedTuple, Optional
+from app.models.models_db import Task
+
+# action -> (required status, new status, error message when the status does not match)
+TRANSITIONS = {
+    "start": ("pending", "in_progress", "Task must be in pending status to start"),
+    "hold": ("in_progress", "on_hold", "Task must be in progress to hold"),
+    "resume": ("on_hold", "in_progress", "Task must be on hold to resume"),
+    "complete": ("in_progress", "completed", "Task must be in progress to complete"),
+    "deny": ("pending", "denied", "Only pending tasks can be denied"),
+}
+
+# Actions whose reason is stored on the task and in the time log
+REASON_ACTIONS = ("hold", "deny")
+
+class TransitionError(Exception):
+    """The task is not in the status the action requires."""
+
+class TransitionResult(NamedTuple):
+    old_status: str
+    duration: int  # seconds added to total_duration_seconds
+    log: dict      # column values for the TaskTimeLog row
+    previous_started_at: Optional[datetime]  # task.started_at before the transition
+
+def apply_transition(task: Task, action: str, reason: Optional[str] = None, now: Optional[datetime] = None) -> TransitionResult:
+    required, new_status, message = TRANSITIONS[action]
+    if task.status != required:
+        raise TransitionError(message)
+    now = now or datetime.utcnow()
+    old_status = task.status
+    previous_started_at = task.started_at
+    duration = 0
+    
+    if action in ("hold", "complete"):
+        # Calculate duration since start and add to total
+        if task.started_at:
+            duration = int((now - task.started_at).total_seconds())
+            task.total_duration_seconds = (task.total_duration_seconds or 0) + duration
+    
+    if action == "start":
+        task.started_at = now
+    elif action == "hold":
+        task.hold_reason = reason
+        task.started_at = None  # Clear started_at when holding
+    elif action == "resume":
+        task.started_at = now
+        task.hold_reason = None
+    elif action == "complete":
+        task.completed_at = now
+    elif action == "deny":
+        task.denial_reason = reason
+    task.status = new_status
+    
+    log = {
+        "id": str(uuid.uuid4()),
+        "task_id": task.id,
+        "action": action,
+        "timestamp": now,
+        "reason": reason if action in REASON_ACTIONS else None,
+    }
+    return TransitionResult(old_status, duration, log, previous_started_at)
@@ -0,0 +1,226 @@
+"""
+Derived task_work_intervals table: one row per stretch of active work on a task.
+
+Task transitions call record_transitions() in the same transaction as the time
+log, so intervals commit or roll back together with it. rebuild_work_intervals()
+replays task_time_logs from scratch (and re-derives tasks.total_duration_seconds).
+work_time_buckets() splits intervals into per-day or per-shift totals.
+"""
+import uuid
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, insert, or_, update
+from sqlalchemy.orm import Session
+from app.models.models_db import Task, TaskTimeLog, TaskWorkInterval
+from app.core.config import SHIFTS
+from app.core.task_workflow import TransitionResult
+from app.core.delta_sync import mark_changed
+
+OPENING_ACTIONS = ("start", "resume")
+CLOSING_ACTIONS = ("hold", "complete")
+
+def _interval_row(task_id: str, machine_id: Optional[str], start_at: datetime) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "task_id": task_id,
+        "machine_id": machine_id,
+        "start_at": start_at,
+        "end_at": None,
+        "end_action": None,
+        "duration_seconds": None,
+    }
+
+def _close(row: dict, end_at: datetime, action: str) -> dict:
+    row["end_at"] = end_at
+    row["end_action"] = action
+    row["duration_seconds"] = max(0, int((end_at - row["start_at"]).total_seconds()))
+    return row
+
+def record_transitions(db: Session, transitions: Iterable[Tuple[Task, TransitionResult]]):
+    """
+    Open an interval for each start/resume and close the open one for each
+    hold/complete. One SELECT for the open intervals, then bulk writes. Does not commit.
+    """
+    opened = []
+    closing: Dict[str, Tuple[Task, TransitionResult]] = {}
+    for task, result in transitions:
+        action = result.log["action"]
+        if action in OPENING_ACTIONS:
+            opened.append(_interval_row(task.id, task.machine_id, result.log["timestamp"]))
+        elif action in CLOSING_ACTIONS:
+            closing[task.id] = (task, result)
+    
+    if closing:
+        open_rows = db.query(
+            TaskWorkInterval.id, TaskWorkInterval.task_id, TaskWorkInterval.start_at
+        ).filter(
+            TaskWorkInterval.task_id.in_(list(closing)),
+            TaskWorkInterval.end_at == None,
+        ).all()
+        
+        updates = []
+        for interval_id, task_id, start_at in open_rows:
+            _, result = closing[task_id]
+            row = _close({"start_at": start_at}, result.log["timestamp"], result.log["action"])
+            row["id"] = interval_id
+            del row["start_at"]
+            updates.append(row)
+        
+        # Tasks started before intervals were tracked have no open row: add a closed one from started_at
+        tracked = {task_id for _, task_id, _ in open_rows}
+        for task_id, (task, result) in closing.items():
+            if task_id not in tracked and result.previous_started_at:
+                row = _interval_row(task_id, task.machine_id, result.previous_started_at)
+                opened.append(_close(row, result.log["timestamp"], result.log["action"]))
+        
+        if updates:
+            db.execute(update(TaskWorkInterval), updates)
+    
+    if opened:
+        db.execute(insert(TaskWorkInterval), opened)
+
+def rebuild_work_intervals(db: Session, batch_size: int = 1000) -> Tuple[int, int]:
+    """
+    Recreate every interval from task_time_logs and reset total_duration_seconds
+    of each logged task to the sum of its closed intervals. Commits.
+    Returns (interval count, task count).
+    """
+    db.query(TaskWorkInterval).delete(synchronize_session=False)
+    
+    logs = db.query(
+        TaskTimeLog.task_id, TaskTimeLog.action, TaskTimeLog.timestamp, Task.machine_id
+    ).join(Task, Task.id == TaskTimeLog.task_id).filter(
+        TaskTimeLog.action.in_(OPENING_ACTIONS + CLOSING_ACTIONS),
+        TaskTimeLog.timestamp != None,
+    ).order_by(TaskTimeLog.task_id, TaskTimeLog.timestamp).yield_per(batch_size)
+    
+    totals: Dict[str, int] = {}
+    batch: List[dict] = []
+    interval_count = 0
+    current = None  # open interval row of the task being replayed
+    
+    def emit(row):
+        nonlocal interval_count
+        batch.append(row)
+        interval_count += 1
+        if len(batch) >= batch_size:
+            db.execute(insert(TaskWorkInterval), batch)
+            batch.clear()
+    
+    for task_id, action, timestamp, machine_id in logs:
+        if current is not None and current["task_id"] != task_id:
+            emit(current)  # left running
+            current = None
+        if action in OPENING_ACTIONS and current is None:
+            # Tasks without any start/resume log keep their stored total
+            totals.setdefault(task_id, 0)
+            current = _interval_row(task_id, machine_id, timestamp)
+        elif action in CLOSING_ACTIONS and current is not None:
+            _close(current, timestamp, action)
+            totals[task_id] += current["duration_seconds"]
+            emit(current)
+            current = None
+    if current is not None:
+        emit(current)
+    if batch:
+        db.execute(insert(TaskWorkInterval), batch)
+    
+    if totals:
+        tasks = Task.__table__
+        db.execute(
+            update(tasks).where(tasks.c.id == bindparam("b_id")).values(
+                total_duration_seconds=bindparam("b_total"),
+                version=tasks.c.version + 1,
+                updated_at=datetime.utcnow(),
+            ),
+            [{"b_id": task_id, "b_total": total} for task_id, total in totals.items()],
+        )
+        mark_changed(db, Task, totals)
+    db.commit()
+    return interval_count, len(totals)
+
+# ---------------------------------------------------------------------------
+# Per-day / per-shift work time
+# ---------------------------------------------------------------------------
+
+def parse_shifts(spec: str) -> List[Tuple[str, time, time]]:
+    """Parse "A=06:00-14:00,B=14:00-22:00" into (label, start, end); end <= start wraps past midnight."""
+    shifts = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        label, hours = part.split("=", 1)
+        start, end = hours.split("-", 1)
+        shifts.append((label.strip(), time.fromisoformat(start.strip()), time.fromisoformat(end.strip())))
+    return shifts
+
+def _windows(date_from: date, date_to: date, group_by: str):
+    """(start, end, day, shift label) windows labelled with the day they start on, sorted by start."""
+    windows = []
+    day = date_from
+    while day <= date_to:
+        if group_by == "shift":
+            for label, start_t, end_t in parse_shifts(SHIFTS):
+                start = datetime.combine(day, start_t)
+                end = datetime.combine(day, end_t)
+                if end <= start:
+                    end += timedelta(days=1)
+                windows.append((start, end, day, label))
+        else:
+            start = datetime.combine(day, time.min)
+            windows.append((start, start + timedelta(days=1), day, None))
+        day += timedelta(days=1)
+    windows.sort()
+    return windows
+
+def work_time_buckets(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    group_by: str = "day",
+    machine_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+) -> List[dict]:
+    """Seconds of active work per (day[, shift], machine), clipping intervals to each window."""
+    windows = _windows(date_from, date_to, group_by)
+    if not windows:
+        return []
+    range_start = windows[0][0]
+    range_end = max(w[1] for w in windows)
+    
+    query = db.query(
+        TaskWorkInterval.machine_id, TaskWorkInterval.start_at, TaskWorkInterval.end_at
+    ).filter(
+        TaskWorkInterval.start_at < range_end,
+        or_(TaskWorkInterval.end_at == None, TaskWorkInterval.end_at > range_start),
+    )
+    if machine_id:
+        query = query.filter(TaskWorkInterval.machine_id == machine_id)
+    if task_id:
+        query = query.filter(TaskWorkInterval.task_id == task_id)
+    
+    now = datetime.utcnow()
+    starts = [w[0] for w in windows]
+    totals = defaultdict(float)
+    for interval_machine, start_at, end_at in query:
+        end_at = end_at or now
+        # First window that could overlap: the last one starting at or before start_at
+        i = max(0, bisect_right(starts, start_at) - 1)
+        while i < len(windows) and windows[i][0] < end_at:
+            w_start, w_end, day, label = windows[i]
+            overlap = (min(end_at, w_end) - max(start_at, w_start)).total_seconds()
+            if overlap > 0:
+                totals[(day, label, interval_machine)] += overlap
+            i += 1
+    
+    result = []
+    for (day, label, interval_machine), seconds in sorted(totals.items(), key=lambda kv: (kv[0][0], kv[0][1] or "", kv[0][2] or "")):
+        entry = {"date": day.isoformat()}
+        if group_by == "shift":
+            entry["shift"] = label
+        entry["machine_id"] = interval_machine
+        entry["work_seconds"] = int(seconds)
+        result.append(entry)
+    return result
@@ -0,0 +1,202 @@
+"""
+Streaming import of work-order sheets (CSV or Excel) into Task + PlanningTask rows.
+
+The file is read in chunks with pandas, so memory stays bounded by the chunk
+size rather than the sheet size. Each chunk is cleaned column-wise, turned
+into rows and written with two multi-row inserts. The whole file is one
+transaction: if any chunk fails to read or insert, nothing is kept, so the
+caller can roll back and the client can retry without creating duplicates.
+
+Recognised columns (case/spacing-insensitive, a few aliases accepted):
+project, part_item, nos_unit, sequence, machine (name or id), title,
+description, priority, assigned_to, due_date. Only project is required;
+title defaults to part_item, sequence to the row's position within its project.
+"""
+import uuid
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.models_db import Task, PlanningTask, Machine
+from app.core import project_stats
+from app.core.delta_sync import stamp_rows
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+COLUMN_ALIASES = {
+    "project": "project",
+    "project_name": "project",
+    "part_item": "part_item",
+    "part": "part_item",
+    "item": "part_item",
+    "nos_unit": "nos_unit",
+    "nos": "nos_unit",
+    "qty": "nos_unit",
+    "quantity": "nos_unit",
+    "sequence": "sequence",
+    "seq": "sequence",
+    "task_sequence": "sequence",
+    "operation": "sequence",
+    "machine": "machine",
+    "machine_id": "machine",
+    "machine_name": "machine",
+    "title": "title",
+    "description": "description",
+    "priority": "priority",
+    "assigned_to": "assigned_to",
+    "operator": "assigned_to",
+    "due_date": "due_date",
+}
+COLUMNS = sorted(set(COLUMN_ALIASES.values()))
+
+def iter_csv_chunks(fileobj: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of the CSV. Blank lines are kept as empty rows so row numbers match the file."""
+    import pandas as pd
+    return pd.read_csv(fileobj, chunksize=chunk_size, dtype=str, keep_default_na=False, skip_blank_lines=False)
+
+def iter_excel_chunks(fileobj: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames from the first sheet; openpyxl's read-only mode streams rows."""
+    import pandas as pd
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Excel import requires the openpyxl package")
+    
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"not a valid .xlsx workbook ({e})")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, [])]
+        batch = []
+        for row in rows:
+            batch.append(["" if v is None else str(v) for v in row])
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+def _blank_rows(df) -> List[bool]:
+    """True for rows whose cells are all empty or whitespace."""
+    return (df.fillna("").astype(str).apply(lambda col: col.str.strip()) == "").all(axis=1).tolist()
+
+def _normalize(df):
+    """Map header aliases to canonical names, add missing columns and strip whitespace."""
+    renamed = {}
+    for col in df.columns:
+        key = str(col).strip().lower().replace(" ", "_").replace("-", "_")
+        canonical = COLUMN_ALIASES.get(key)
+        if canonical and canonical not in renamed.values():
+            renamed[col] = canonical
+    df = df[list(renamed)].rename(columns=renamed)
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[COLUMNS].fillna("").astype(str)
+    for col in COLUMNS:
+        df[col] = df[col].str.strip()
+    # Empty title falls back to the part name
+    df["title"] = df["title"].where(df["title"] != "", df["part_item"])
+    df["priority"] = df["priority"].str.lower().where(df["priority"] != "", "medium")
+    return df
+
+def import_work_orders(db: Session, chunks: Iterator) -> dict:
+    """
+    Insert Task + PlanningTask rows for every valid sheet row and commit once
+    at the end; on an exception nothing is committed and the caller rolls back.
+    Row numbers in errors are spreadsheet rows (header is row 1). Blank rows
+    are skipped without an error but still counted, so later numbers stay right.
+    """
+    machines: Dict[str, str] = {}
+    for machine_id, name in db.query(Machine.id, Machine.name).all():
+        machines[machine_id] = machine_id
+        if name:
+            machines.setdefault(name.strip().lower(), machine_id)
+    
+    next_sequence: Dict[str, int] = {}
+    summary = {"rows_read": 0, "tasks_created": 0, "planning_tasks_created": 0, "error_count": 0}
+    errors: List[dict] = []
+    row_number = 1  # header row
+    
+    for raw_chunk in chunks:
+        blank_rows = _blank_rows(raw_chunk)
+        df = _normalize(raw_chunk)
+        now = datetime.utcnow()
+        task_rows = []
+        planning_rows = []
+        
+        for record, blank in zip(df.to_dict("records"), blank_rows):
+            row_number += 1
+            if blank:
+                continue
+            summary["rows_read"] += 1
+            problem = None
+            
+            project = record["project"]
+            machine_id = None
+            sequence = None
+            if not project:
+                problem = "project is required"
+            elif not record["title"]:
+                problem = "title or part_item is required"
+            if not problem and record["machine"]:
+                machine_id = machines.get(record["machine"]) or machines.get(record["machine"].lower())
+                if not machine_id:
+                    problem = f"unknown machine '{record['machine']}'"
+            if not problem and record["sequence"]:
+                try:
+                    sequence = int(float(record["sequence"]))
+                except ValueError:
+                    problem = f"invalid sequence '{record['sequence']}'"
+            
+            if problem:
+                summary["error_count"] += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": row_number, "error": problem})
+                continue
+            
+            if sequence is None:
+                sequence = next_sequence.get(project, 0) + 1
+            next_sequence[project] = max(next_sequence.get(project, 0), sequence)
+            
+            task_id = str(uuid.uuid4())
+            task_rows.append({
+                "id": task_id,
+                "title": record["title"],
+                "project": project,
+                "description": record["description"] or None,
+                "part_item": record["part_item"] or None,
+                "nos_unit": record["nos_unit"] or None,
+                "status": "pending",
+                "priority": record["priority"],
+                "assigned_to": record["assigned_to"] or None,
+                "machine_id": machine_id,
+                "due_date": record["due_date"] or None,
+                "created_at": now,
+                "total_duration_seconds": 0,
+            })
+            planning_rows.append({
+                "id": str(uuid.uuid4()),
+                "task_id": task_id,
+                "project_name": project,
+                "task_sequence": sequence,
+                "status": "planning",
+                "updated_at": now,
+            })
+        
+        if task_rows:
+            db.execute(insert(Task), stamp_rows(db, task_rows))
+            db.execute(insert(PlanningTask), planning_rows)
+            project_stats.tasks_added_bulk(db, task_rows)
+            summary["tasks_created"] += len(task_rows)
+            summary["planning_tasks_created"] += len(planning_rows)
+    
+    db.commit()
+    summary["errors"] = errors
+    return summary
@@ -1,5 +1,8 @@
-from fastapi import FastAPI
+from app.core.startup import startup_report  # first, so import time is measured
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from app.routers import (
     users_router,
     machines_routers,
@@ -15,10 +18,26 @@ from app.routers import (
     admin_router,
     subtasks_router,
     seed_router,
+    internal_router,
+    export_router,
+    events_router,
 )
-from app.core.config import CORS_ORIGINS
+from app.core.config import (
+    CORS_ORIGINS,
+    COMPRESSION_MINIMUM_SIZE,
+    GZIP_COMPRESSLEVEL,
+    BROTLI_QUALITY,
+    SEED_DEMO_USERS,
+    STARTUP_BUDGET_SECONDS,
+)
+from app.core.hashing_pool import HashingPoolBusy
 import uvicorn
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional, gzip only
+    BrotliMiddleware = None
+
 # Create FastAPI app with metadata
 app = FastAPI(
     title="Workflow Tracker API",
@@ -42,31 +61,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that send Accept-Encoding (large task lists
+# and exports over factory Wi-Fi). Server-sent events must not be buffered.
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=BROTLI_QUALITY,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        gzip_fallback=True,
+        excluded_handlers=[r"^/events/stream"],
+    )
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE, compresslevel=GZIP_COMPRESSLEVEL)
 
-# Startup event – create tables and demo users
+
+# Startup event – create missing tables, then demo users if enabled.
+# Timings are kept in startup_report (GET /internal/startup).
 @app.on_event("startup")
 async def startup_event():
-    from app.core.database import Base, engine
-    from app.models.models_db import Subtask  # Import to ensure table is registered
-    from create_demo_users import create_demo_users
+    from app.core.database import engine
+    from app.core.schema_version import ensure_schema
+    from create_demo_users import create_demo_users, ensure_default_admin
     
     try:
         print("🚀 Running startup tasks...")
+        startup_report.mark("imports")
         
-        # Create all database tables (including new Subtask table)
-        print("📊 Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created/verified")
+        # Create tables only when the models changed since the last boot
+        with startup_report.phase("schema"):
+            startup_report.schema_changed = ensure_schema(engine)
+        if startup_report.schema_changed:
+            print("✅ Database tables created/verified")
+        else:
+            print("✅ Database schema up to date, skipped table creation")
         
-        # Create demo users
-        print("👥 Creating demo users...")
-        create_demo_users()
-        print("✅ Demo users created/verified")
+        with startup_report.phase("demo_users"):
+            if SEED_DEMO_USERS:
+                print("👥 Creating demo users...")
+                create_demo_users()
+                startup_report.demo_users_seeded = True
+                print("✅ Demo users created/verified")
+            else:
+                ensure_default_admin()
         
-        print("✅ Startup complete")
+        if startup_report.finish() is False:
+            print(
+                f"⚠️  Startup took {startup_report.total_seconds:.2f}s, "
+                f"over the {STARTUP_BUDGET_SECONDS:g}s budget: {startup_report.phases}"
+            )
+        print(f"✅ Startup complete in {startup_report.total_seconds:.2f}s")
     except Exception as e:
         print(f"❌ Error during startup: {e}")
 
+# Password hashing pool saturated (e.g. login burst at shift start)
+@app.exception_handler(HashingPoolBusy)
+async def hashing_pool_busy_handler(request: Request, exc: HashingPoolBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -96,6 +151,9 @@ app.include_router(user_skills_router.router)
 app.include_router(approvals_router.router)
 app.include_router(subtasks_router.router)
 app.include_router(seed_router.router)
+app.include_router(internal_router.router)
+app.include_router(export_router.router)
+app.include_router(events_router.router)
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
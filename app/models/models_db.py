@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -101,9 +101,42 @@ class Task(Base):
     hold_reason = Column(String, nullable=True)
     denial_reason = Column(String, nullable=True)
 
+    # Optimistic concurrency: every ORM UPDATE/DELETE is issued as
+    # "... WHERE id = :id AND version = :version" and bumps the version
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Delta sync (GET /tasks/changes): stamped by app.core.delta_sync on every write
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(Integer, nullable=True, index=True)
+
     # Relationships
     machine = relationship("Machine")
 
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Date-range filtering and keyset pagination on GET /tasks
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Operator queues ("what is X working on") and per-project progress
+        Index("ix_tasks_status_assigned_to", "status", "assigned_to"),
+        Index("ix_tasks_project_status", "project", "status"),
+        # Completed tasks per operator over a date range
+        Index("ix_tasks_status_completed_at", "status", "completed_at", "assigned_to"),
+    )
+
+class ProjectStats(Base):
+    """Per-project task rollup, kept in step with task writes by app.core.project_stats."""
+    __tablename__ = "project_stats"
+
+    project = Column(String, primary_key=True, index=True)
+    total_tasks = Column(Integer, default=0)
+    completed_tasks = Column(Integer, default=0)
+    in_progress_tasks = Column(Integer, default=0)
+    on_hold_tasks = Column(Integer, default=0)
+    denied_tasks = Column(Integer, default=0)
+    total_duration_seconds = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class TaskTimeLog(Base):
     __tablename__ = "task_time_logs"
 
@@ -116,6 +149,32 @@ class TaskTimeLog(Base):
     # Relationship
     task = relationship("Task")
 
+    __table_args__ = (
+        # A task's history in order, and per-action counts over a date range (operator report)
+        Index("ix_task_time_logs_task_id_timestamp", "task_id", "timestamp"),
+        Index("ix_task_time_logs_action_timestamp", "action", "timestamp"),
+    )
+
+class TaskWorkInterval(Base):
+    """
+    One stretch of active work on a task (start/resume -> hold/complete), derived
+    from task_time_logs by app.core.work_intervals. end_at is NULL while running.
+    """
+    __tablename__ = "task_work_intervals"
+
+    id = Column(String, primary_key=True, index=True)
+    task_id = Column(String, ForeignKey("tasks.id"), nullable=False)
+    machine_id = Column(String, nullable=True)  # task's machine when the interval opened
+    start_at = Column(DateTime, nullable=False)
+    end_at = Column(DateTime, nullable=True)
+    end_action = Column(String, nullable=True)  # hold, complete
+    duration_seconds = Column(Integer, nullable=True)  # set when the interval closes
+
+    __table_args__ = (
+        Index("ix_task_work_intervals_task_start", "task_id", "start_at"),
+        Index("ix_task_work_intervals_machine_start", "machine_id", "start_at"),
+    )
+
 class PlanningTask(Base):
     __tablename__ = "planning_tasks"
 
@@ -145,6 +204,7 @@ class OutsourceItem(Base):
     cost = Column(Float)
     expected_date = Column(String, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(Integer, nullable=True, index=True)  # see app.core.delta_sync
     
     # Relationship
     task = relationship("Task")
@@ -172,6 +232,39 @@ class Subtask(Base):
     notes = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(Integer, nullable=True, index=True)  # see app.core.delta_sync
 
     # Relationship
     task = relationship("Task")
+
+class TableVersion(Base):
+    """Per-table write counters behind list-endpoint ETags (app.core.table_versions)."""
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class ChangeCounter(Base):
+    """Named monotonic counters; "sync" hands out change_seq values (app.core.delta_sync)."""
+    __tablename__ = "change_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class SyncTombstone(Base):
+    """Deleted task/subtask/outsource rows, reported as deletes by GET /tasks/changes."""
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # tasks, subtasks, outsource_items
+    entity_id = Column(String, nullable=False)
+    change_seq = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+class SchemaVersion(Base):
+    """Fingerprint of the metadata create_all last ran with (app.core.schema_version)."""
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True)  # single row, id=1
+    metadata_hash = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
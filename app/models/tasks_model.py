@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class TaskBase(BaseModel):
@@ -18,6 +18,17 @@ class TaskBase(BaseModel):
 class TaskCreate(TaskBase):
     pass
 
+class TaskBulkCreate(BaseModel):
+    # Items are validated one by one against TaskCreate so errors can be reported per item
+    tasks: List[Dict[str, Any]]
+    atomic: bool = False  # when true, any invalid item rejects the whole batch
+
+class TaskBatchTransition(BaseModel):
+    action: str = Field(..., pattern="^(start|hold|resume|complete|deny)$")
+    task_ids: List[str]
+    reason: Optional[str] = None  # stored for hold/deny
+    atomic: bool = False  # when true, any task that cannot transition rejects the whole batch
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     project: Optional[str] = None
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 from app.core.database import get_db
 from app.models.models_db import User, UserApproval
-from app.core.dependencies import get_current_active_admin
-from app.core.auth_utils import hash_password, verify_password
+from app.core.dependencies import get_current_active_admin, invalidate_principal
+from app.core.cache import response_cache, ANALYTICS, PLANNING_OVERVIEW
+from app.core.hashing_pool import hash_password_async, verify_password_async
 
 router = APIRouter(
     prefix="/admin",
@@ -45,12 +47,12 @@ class UserResponse(BaseModel):
         orm_mode = True
 
 @router.get("/users", response_model=List[UserResponse])
-async def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(db: Session = Depends(get_db)):
     users = db.query(User).all()
     return users
 
 @router.get("/pending-users", response_model=List[UserResponse])
-async def get_pending_users(db: Session = Depends(get_db)):
+def get_pending_users(db: Session = Depends(get_db)):
     users = db.query(User).filter(User.approval_status == "pending").all()
     return users
 
@@ -61,7 +63,7 @@ async def change_admin_password(
     db: Session = Depends(get_db)
 ):
     # Verify old password
-    if not verify_password(request.old_password, current_admin.password_hash):
+    if not await verify_password_async(request.old_password, current_admin.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect old password")
     
     # Check if new passwords match
@@ -69,13 +71,15 @@ async def change_admin_password(
         raise HTTPException(status_code=400, detail="New passwords do not match")
     
     # Update password
-    current_admin.password_hash = hash_password(request.new_password)
-    db.commit()
+    username = current_admin.username
+    current_admin.password_hash = await hash_password_async(request.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_principal(username)
     
     return {"message": "Password updated successfully"}
 
 @router.post("/users/{username}/approve")
-async def approve_user(
+def approve_user(
     username: str,
     request: ApproveUserRequest,
     current_admin: User = Depends(get_current_active_admin),
@@ -110,10 +114,12 @@ async def approve_user(
         db.add(new_approval)
     
     db.commit()
+    invalidate_principal(user.username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     return {"message": f"User {username} approved and assigned to unit {request.unit_id}"}
 
 @router.post("/users/{username}/reject")
-async def reject_user(
+def reject_user(
     username: str,
     current_admin: User = Depends(get_current_active_admin),
     db: Session = Depends(get_db)
@@ -132,26 +138,32 @@ async def reject_user(
         approval.approved_at = datetime.utcnow()
         
     db.commit()
+    invalidate_principal(user.username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     return {"message": f"User {username} rejected"}
 
 @router.patch("/users/{user_id}/status")
-async def update_user_status(user_id: str, status_update: UserStatusUpdate, db: Session = Depends(get_db)):
+def update_user_status(user_id: str, status_update: UserStatusUpdate, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.approval_status = status_update.status
     db.commit()
+    invalidate_principal(user.username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     db.refresh(user)
     return {"message": f"User status updated to {status_update.status}"}
 
 @router.patch("/users/{user_id}/role")
-async def update_user_role(user_id: str, role_update: UserRoleUpdate, db: Session = Depends(get_db)):
+def update_user_role(user_id: str, role_update: UserRoleUpdate, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.role = role_update.role
     db.commit()
+    invalidate_principal(user.username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     db.refresh(user)
     return {"message": f"User role updated to {role_update.role}"}
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, case, func
 from app.models.analytics_model import AnalyticsData
 from app.models.models_db import Task, Machine, OutsourceItem
 from app.core.database import get_db
+from app.core.cache import response_cache, ANALYTICS
+from app.core.work_intervals import work_time_buckets
+from app.core.machine_utilization import machine_utilization
+from app.core.operator_report import operator_productivity
 from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Optional
 
 router = APIRouter(
     prefix="/analytics",
@@ -13,39 +19,56 @@ router = APIRouter(
 )
 
 @router.get("/")
-async def get_analytics(db: Session = Depends(get_db)):
+def get_analytics(db: Session = Depends(get_db)):
+    from datetime import datetime
+    today_str = datetime.utcnow().strftime('%Y-%m-%d')
+    
+    cached = response_cache.get(ANALYTICS, date=today_str)
+    if cached is not None:
+        return cached
+    
     # 1. Active Projects
-    # Count distinct projects where tasks are not completed
-    active_projects_query = db.query(Task.project).filter(
-        Task.status.in_(['pending', 'in_progress', 'on_hold']),
-        Task.project != None
-    ).distinct()
-    active_projects_count = active_projects_query.count()
-    active_projects_list = [p[0] for p in active_projects_query.all()]
+    # Distinct projects where tasks are not completed (one query, count derived from the list)
+    active_projects_list = [
+        p for (p,) in db.query(Task.project).filter(
+            Task.status.in_(['pending', 'in_progress', 'on_hold']),
+            Task.project != None
+        ).distinct().all()
+    ]
+    active_projects_count = len(active_projects_list)
 
     # 2. Attendance
+    # Every user with a present/absent flag for today, via LEFT JOIN + CASE
     from app.models.models_db import Attendance, User
-    from datetime import datetime
-    today_str = datetime.utcnow().strftime('%Y-%m-%d')
-    
-    present_users = db.query(User).join(Attendance).filter(
-        Attendance.date == today_str,
-        Attendance.status == 'present'
-    ).all()
     
-    total_users_count = db.query(User).count()
-    present_count = len(present_users)
-    absent_count = total_users_count - present_count
+    attendance_rows = db.query(
+        User.username,
+        User.full_name,
+        User.role,
+        func.max(case((Attendance.id != None, 1), else_=0)),
+    ).outerjoin(
+        Attendance,
+        and_(
+            Attendance.user_id == User.user_id,
+            Attendance.date == today_str,
+            Attendance.status == 'present'
+        )
+    ).group_by(User.user_id, User.username, User.full_name, User.role).all()
     
-    present_list = [{"username": u.username, "full_name": u.full_name, "role": u.role} for u in present_users]
+    present_list = []
+    absent_list = []
+    for username, full_name, role, is_present in attendance_rows:
+        entry = {"username": username, "full_name": full_name, "role": role}
+        (present_list if is_present else absent_list).append(entry)
     
-    # Get absent users (simplistic approach: all users not in present list)
-    present_ids = [u.user_id for u in present_users]
-    absent_users = db.query(User).filter(User.user_id.notin_(present_ids)).all()
-    absent_list = [{"username": u.username, "full_name": u.full_name, "role": u.role} for u in absent_users]
+    present_count = len(present_list)
+    absent_count = len(absent_list)
+
+    # 3. Task counts by status (total derived from the same grouped query)
+    status_counts = db.query(Task.status, func.count(Task.id)).group_by(Task.status).all()
 
     # Return dict to bypass strict Pydantic model for now
-    return {
+    result = {
         "active_projects_count": active_projects_count,
         "active_projects_list": active_projects_list,
         "attendance": {
@@ -55,6 +78,82 @@ async def get_analytics(db: Session = Depends(get_db)):
             "absent_list": absent_list
         },
         # Keep existing data for compatibility if needed, or just return what's requested
-        "total_tasks": db.query(Task).count(),
-        "tasks_by_status": {s: count for s, count in db.query(Task.status, func.count(Task.status)).group_by(Task.status).all() if s}
+        "total_tasks": sum(count for _, count in status_counts),
+        "tasks_by_status": {s: count for s, count in status_counts if s}
     }
+    response_cache.set(result, ANALYTICS, date=today_str)
+    return result
+
+MAX_WORK_TIME_DAYS = 92
+
+@router.get("/work-time")
+def get_work_time(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    group_by: str = Query("day", pattern="^(day|shift)$"),
+    machine_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Active work seconds per day (or per shift, see SHIFTS in config) and machine,
+    computed from task_work_intervals. Defaults to today (UTC); running
+    intervals count up to now.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if (date_to - date_from).days >= MAX_WORK_TIME_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_WORK_TIME_DAYS} days")
+    
+    buckets = work_time_buckets(db, date_from, date_to, group_by, machine_id=machine_id, task_id=task_id)
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "group_by": group_by,
+        "buckets": buckets,
+    }
+
+MAX_UTILIZATION_DAYS = 366
+
+@router.get("/machines")
+def get_machine_utilization(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    machine_id: Optional[str] = None,
+    unit_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Per-machine busy, hold and idle hours and cost (busy hours x hourly_rate)
+    from task_work_intervals. Defaults to the last 30 days (UTC) up to today.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if (date_to - date_from).days >= MAX_UTILIZATION_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_UTILIZATION_DAYS} days")
+    
+    return machine_utilization(db, date_from, date_to, machine_id=machine_id, unit_id=unit_id)
+
+@router.get("/operators")
+def get_operator_productivity(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Per-operator completed tasks, active seconds, hold count and average cycle
+    time (first start to completion) for tasks assigned to them. Defaults to the
+    last 30 days (UTC) up to today.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if (date_to - date_from).days >= MAX_UTILIZATION_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_UTILIZATION_DAYS} days")
+    
+    return operator_productivity(db, date_from, date_to)
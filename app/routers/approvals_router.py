@@ -1,11 +1,14 @@
 """
 User Approvals Router - API endpoints for user approval workflow
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-from ..core.database import get_db_connection
+from sqlalchemy.orm import Session
+from ..core.database import get_db
+from ..core.dependencies import invalidate_principal
+from ..models import models_db
 
 router = APIRouter(prefix="/api/approvals", tags=["approvals"])
 
@@ -22,24 +25,18 @@ class ApprovalAction(BaseModel):
     notes: Optional[str] = None
 
 @router.get("/pending")
-async def get_pending_approvals():
+def get_pending_approvals(db: Session = Depends(get_db)):
     """Get all pending user approvals with user details"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    ua, u = models_db.UserApproval, models_db.User
+    rows = db.query(
+        ua.id, ua.user_id, ua.status, ua.approved_by, ua.approved_at, ua.notes, ua.created_at,
+        u.username, u.full_name, u.email, u.date_of_birth, u.address, u.contact_number, u.unit_id
+    ).join(u, ua.user_id == u.user_id).filter(
+        ua.status == 'pending'
+    ).order_by(ua.created_at.desc()).all()
     
-    cursor.execute("""
-        SELECT 
-            ua.id, ua.user_id, ua.status, ua.approved_by, ua.approved_at, ua.notes, ua.created_at,
-            u.username, u.full_name, u.email, u.date_of_birth, u.address, u.contact_number, u.unit_id
-        FROM user_approvals ua
-        JOIN users u ON ua.user_id = u.user_id
-        WHERE ua.status = 'pending'
-        ORDER BY ua.created_at DESC
-    """)
-    
-    approvals = []
-    for row in cursor.fetchall():
-        approvals.append({
+    return [
+        {
             "id": row[0],
             "user_id": row[1],
             "status": row[2],
@@ -56,65 +53,47 @@ async def get_pending_approvals():
                 "contact_number": row[12],
                 "unit_id": row[13]
             }
-        })
+        }
+        for row in rows
+    ]
+
+def _set_approval_status(db: Session, user_id: str, status: str, decided_by: str, notes: Optional[str]):
+    # Update approval record
+    db.query(models_db.UserApproval).filter(models_db.UserApproval.user_id == user_id).update(
+        {
+            models_db.UserApproval.status: status,
+            models_db.UserApproval.approved_by: decided_by,
+            models_db.UserApproval.approved_at: datetime.utcnow(),
+            models_db.UserApproval.notes: notes,
+        },
+        synchronize_session=False
+    )
+    
+    # Update user status
+    user = db.query(models_db.User).filter(models_db.User.user_id == user_id).first()
+    if user:
+        user.approval_status = status
     
-    conn.close()
-    return approvals
+    db.commit()
+    if user:
+        invalidate_principal(user.username)
 
 @router.post("/{user_id}/approve")
-async def approve_user(user_id: str, action: ApprovalAction, approved_by: str = "admin"):
+def approve_user(user_id: str, action: ApprovalAction, approved_by: str = "admin", db: Session = Depends(get_db)):
     """Approve a user"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        # Update approval record
-        cursor.execute("""
-            UPDATE user_approvals
-            SET status = 'approved', approved_by = ?, approved_at = CURRENT_TIMESTAMP, notes = ?
-            WHERE user_id = ?
-        """, (approved_by, action.notes, user_id))
-        
-        # Update user status
-        cursor.execute("""
-            UPDATE users
-            SET approval_status = 'approved'
-            WHERE user_id = ?
-        """, (user_id,))
-        
-        conn.commit()
+        _set_approval_status(db, user_id, 'approved', approved_by, action.notes)
         return {"message": f"User {user_id} approved successfully"}
     except Exception as e:
-        conn.rollback()
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        conn.close()
 
 @router.post("/{user_id}/reject")
-async def reject_user(user_id: str, action: ApprovalAction, rejected_by: str = "admin"):
+def reject_user(user_id: str, action: ApprovalAction, rejected_by: str = "admin", db: Session = Depends(get_db)):
     """Reject a user"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        # Update approval record
-        cursor.execute("""
-            UPDATE user_approvals
-            SET status = 'rejected', approved_by = ?, approved_at = CURRENT_TIMESTAMP, notes = ?
-            WHERE user_id = ?
-        """, (rejected_by, action.notes, user_id))
-        
-        # Update user status
-        cursor.execute("""
-            UPDATE users
-            SET approval_status = 'rejected'
-            WHERE user_id = ?
-        """, (user_id,))
-        
-        conn.commit()
+        _set_approval_status(db, user_id, 'rejected', rejected_by, action.notes)
         return {"message": f"User {user_id} rejected"}
     except Exception as e:
-        conn.rollback()
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        conn.close()
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.models.auth_model import LoginRequest, LoginResponse, SecurityQuestionRequest, PasswordResetRequest
-from app.core.auth_utils import verify_password, create_access_token, hash_password
+from app.core.auth_utils import create_access_token
+from app.core.hashing_pool import verify_password_async, hash_password_async, HashingPoolBusy
 from app.core.database import get_db
+from app.core.cache import response_cache, ANALYTICS, PLANNING_OVERVIEW
+from app.core.dependencies import invalidate_principal
 from app.models.models_db import User
 
 router = APIRouter(
@@ -11,7 +15,7 @@ router = APIRouter(
 )
 
 @router.post("/get-security-question")
-async def get_security_question(request: SecurityQuestionRequest, db: Session = Depends(get_db)):
+def get_security_question(request: SecurityQuestionRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.username == request.username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -23,7 +27,10 @@ async def get_security_question(request: SecurityQuestionRequest, db: Session =
 
 @router.post("/reset-password")
 async def reset_password(request: PasswordResetRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == request.username).first()
+    # DB work runs on the threadpool, bcrypt on the hashing pool; neither blocks the event loop
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == request.username).first()
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
@@ -35,11 +42,39 @@ async def reset_password(request: PasswordResetRequest, db: Session = Depends(ge
         raise HTTPException(status_code=400, detail="Incorrect security answer")
         
     # Update password
-    user.password_hash = hash_password(request.new_password)
-    db.commit()
+    user.password_hash = await hash_password_async(request.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_principal(request.username)
     
     return {"message": "Password reset successfully"}
 
+def _record_attendance(db: Session, user: User):
+    try:
+        from app.models.models_db import Attendance
+        from datetime import datetime
+        today_str = datetime.utcnow().strftime('%Y-%m-%d')
+        
+        # Check if already marked for today
+        existing_attendance = db.query(Attendance).filter(
+            Attendance.user_id == user.user_id,
+            Attendance.date == today_str
+        ).first()
+        
+        if not existing_attendance:
+            new_attendance = Attendance(
+                user_id=user.user_id,
+                date=today_str,
+                status='present',
+                # ip_address=request.client.host # Requires Request object, skipping for now
+            )
+            db.add(new_attendance)
+            db.commit()
+            response_cache.invalidate(ANALYTICS)
+            print(f"Attendance marked for {user.username}")
+    except Exception as e:
+        print(f"Error marking attendance: {e}")
+        # Don't fail login if attendance fails
+
 @router.post("/login", response_model=LoginResponse)
 async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """
@@ -53,7 +88,9 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     try:
         # Find user by username in SQLite
         t1 = time.time()
-        user = db.query(User).filter(User.username == credentials.username).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.username == credentials.username).first()
+        )
         print(f"Database query took: {time.time() - t1:.4f}s")
         
         if not user:
@@ -81,7 +118,7 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
         
         # Verify password
         t2 = time.time()
-        is_valid = verify_password(credentials.password, user.password_hash)
+        is_valid = await verify_password_async(credentials.password, user.password_hash)
         print(f"Password verification took: {time.time() - t2:.4f}s")
         
         if not is_valid:
@@ -109,30 +146,7 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
         print(f"Token creation took: {time.time() - t3:.4f}s")
         
         # Record Attendance
-        try:
-            from app.models.models_db import Attendance
-            from datetime import datetime
-            today_str = datetime.utcnow().strftime('%Y-%m-%d')
-            
-            # Check if already marked for today
-            existing_attendance = db.query(Attendance).filter(
-                Attendance.user_id == user.user_id,
-                Attendance.date == today_str
-            ).first()
-            
-            if not existing_attendance:
-                new_attendance = Attendance(
-                    user_id=user.user_id,
-                    date=today_str,
-                    status='present',
-                    # ip_address=request.client.host # Requires Request object, skipping for now
-                )
-                db.add(new_attendance)
-                db.commit()
-                print(f"Attendance marked for {user.username}")
-        except Exception as e:
-            print(f"Error marking attendance: {e}")
-            # Don't fail login if attendance fails
+        await run_in_threadpool(_record_attendance, db, user)
         
         print(f"Total login time: {time.time() - start_time:.4f}s")
         
@@ -148,7 +162,7 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
                 "full_name": user.full_name
             }
         )
-    except HTTPException:
+    except (HTTPException, HashingPoolBusy):
         raise
     except Exception as e:
         print(f"Login error: {str(e)}")
@@ -165,15 +179,7 @@ async def get_current_user():
     """
     return {"message": "Current user endpoint - requires JWT middleware"}
 
-@router.post("/signup")
-async def signup(user_data: dict, db: Session = Depends(get_db)):
-    """
-    Register new user with onboarding data.
-    User will be in 'pending' status until admin approves.
-    """
-    from app.core.auth_utils import hash_password
-    import uuid
-    
+def _check_signup_available(db: Session, user_data: dict):
     # Check if username already exists
     existing_user = db.query(User).filter(User.username == user_data['username']).first()
     if existing_user:
@@ -190,12 +196,17 @@ async def signup(user_data: dict, db: Session = Depends(get_db)):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists"
             )
+
+def _create_signup_user(db: Session, user_data: dict, password_hash: str) -> str:
+    """Insert the pending user, its skills and approval record; returns the new user_id."""
+    import uuid
     
     # Create new user
+    user_id = str(uuid.uuid4())
     new_user = User(
-        user_id=str(uuid.uuid4()),
+        user_id=user_id,
         username=user_data['username'],
-        password_hash=hash_password(user_data['password']),
+        password_hash=password_hash,
         email=user_data.get('email'),
         full_name=user_data.get('full_name'),
         role='operator', # Enforce operator role for self-signup
@@ -208,7 +219,6 @@ async def signup(user_data: dict, db: Session = Depends(get_db)):
     
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
     
     # Add skills if present
     if 'skills' in user_data and isinstance(user_data['skills'], list):
@@ -217,7 +227,7 @@ async def signup(user_data: dict, db: Session = Depends(get_db)):
             # skill should be {'machine_id': '...', 'skill_level': '...'}
             if skill.get('machine_id'):
                 new_skill = UserMachine(
-                    user_id=new_user.user_id,
+                    user_id=user_id,
                     machine_id=skill.get('machine_id'),
                     skill_level=skill.get('skill_level', 'intermediate')
                 )
@@ -227,14 +237,27 @@ async def signup(user_data: dict, db: Session = Depends(get_db)):
     # Create approval record
     from app.models.models_db import UserApproval
     new_approval = UserApproval(
-        user_id=new_user.user_id,
+        user_id=user_id,
         status='pending'
     )
     db.add(new_approval)
     db.commit()
+    return user_id
+
+@router.post("/signup")
+async def signup(user_data: dict, db: Session = Depends(get_db)):
+    """
+    Register new user with onboarding data.
+    User will be in 'pending' status until admin approves.
+    DB work runs on the threadpool and bcrypt on the hashing pool.
+    """
+    await run_in_threadpool(_check_signup_available, db, user_data)
+    password_hash = await hash_password_async(user_data['password'])
+    user_id = await run_in_threadpool(_create_signup_user, db, user_data, password_hash)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     
     return {
         "message": "User registered successfully. Pending admin approval.",
-        "user_id": new_user.user_id,
-        "username": new_user.username
+        "user_id": user_id,
+        "username": user_data['username']
     }
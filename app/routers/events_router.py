@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.core.config import EVENTS_HEARTBEAT_SECONDS
+from app.core.events import event_broker, TOPICS
+import asyncio
+import json
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+def _format(event: dict) -> str:
+    return f"event: {event['topic']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    topics: str = Query(",".join(TOPICS), description="Comma-separated: task, machine"),
+    unit_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """
+    Server-Sent Events stream of task and machine changes, so screens can stop
+    polling GET /tasks and GET /machines. unit_id keeps events for machines (and
+    tasks on machines) of that unit; user_id keeps tasks assigned to / machines
+    operated by that user. A comment line is sent every EVENTS_HEARTBEAT_SECONDS;
+    on a "resync" event the client should refetch its lists.
+    """
+    requested = {t.strip() for t in topics.split(",") if t.strip()}
+    unknown = requested - set(TOPICS)
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"topics must be a subset of {', '.join(TOPICS)}")
+    
+    subscription = event_broker.subscribe(requested, unit_id=unit_id, user_id=user_id)
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.lagged:
+                    subscription.lagged = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield _format({"topic": "resync", "type": "resync"})
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                yield _format(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
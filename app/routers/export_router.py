@@ -0,0 +1,121 @@
+"""
+Export Router - streaming CSV / NDJSON exports of tasks, time logs and outsource items
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from app.core.database import SessionLocal
+from app.core.serializers import RowSerializer, TASK_COLUMNS, OUTSOURCE_COLUMNS
+from app.core.responses import dumps
+from app.models.models_db import Task, TaskTimeLog, OutsourceItem
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+FORMAT_PATTERN = "^(csv|ndjson)$"
+YIELD_PER = 1000  # rows fetched per round trip from a server-side cursor
+FLUSH_EVERY = 500  # rows per chunk written to the response
+
+TIME_LOG_COLUMNS = [
+    TaskTimeLog.id, TaskTimeLog.task_id, TaskTimeLog.action, TaskTimeLog.timestamp, TaskTimeLog.reason,
+]
+
+def _cell(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _stream_rows(stmt, fmt: str):
+    """
+    Yield the statement's rows as CSV or NDJSON text, a chunk at a time.
+    Uses its own session: the request's get_db session is closed before a
+    streaming body is sent.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=YIELD_PER))
+        serialize = RowSerializer(stmt.selected_columns)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(serialize.keys)
+        
+        pending = 0
+        for row in result:
+            if writer:
+                writer.writerow([_cell(v) for v in row])
+            else:
+                buffer.write(dumps(serialize(row)).decode("utf-8"))
+                buffer.write("\n")
+            pending += 1
+            if pending >= FLUSH_EVERY:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+def _response(stmt, fmt: str, name: str) -> StreamingResponse:
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        _stream_rows(stmt, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/tasks")
+def export_tasks(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    project: Optional[str] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """Stream all tasks (optionally filtered) as CSV or NDJSON"""
+    stmt = select(*TASK_COLUMNS)
+    if project is not None:
+        stmt = stmt.where(Task.project == project)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if created_from is not None:
+        stmt = stmt.where(Task.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Task.created_at < created_to)
+    return _response(stmt.order_by(Task.created_at, Task.id), format, "tasks")
+
+@router.get("/time-logs")
+def export_time_logs(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    task_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Stream task time logs as CSV or NDJSON"""
+    stmt = select(*TIME_LOG_COLUMNS)
+    if task_id is not None:
+        stmt = stmt.where(TaskTimeLog.task_id == task_id)
+    if start is not None:
+        stmt = stmt.where(TaskTimeLog.timestamp >= start)
+    if end is not None:
+        stmt = stmt.where(TaskTimeLog.timestamp < end)
+    return _response(stmt.order_by(TaskTimeLog.timestamp, TaskTimeLog.id), format, "time_logs")
+
+@router.get("/outsource")
+def export_outsource_items(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    status: Optional[str] = None,
+    vendor: Optional[str] = None,
+):
+    """Stream outsource items as CSV or NDJSON"""
+    stmt = select(*OUTSOURCE_COLUMNS)
+    if status is not None:
+        stmt = stmt.where(OutsourceItem.status == status)
+    if vendor is not None:
+        stmt = stmt.where(OutsourceItem.vendor == vendor)
+    return _response(stmt.order_by(OutsourceItem.id), format, "outsource_items")
@@ -0,0 +1,30 @@
+"""
+Internal Router - operational metrics for sizing workers and pools
+"""
+from fastapi import APIRouter
+from app.core.hashing_pool import hashing_pool
+from app.core.database import get_pool_stats
+from app.core.events import event_broker
+from app.core.startup import startup_report
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+@router.get("/hashing")
+def get_hashing_pool_metrics():
+    """bcrypt thread pool queue depth, rejections and timings"""
+    return hashing_pool.metrics()
+
+@router.get("/pool")
+def get_db_pool_metrics():
+    """Database connection pool: checked-out/overflow counts and saturation"""
+    return get_pool_stats()
+
+@router.get("/events")
+def get_event_stream_metrics():
+    """Open /events/stream connections in this process"""
+    return {"subscribers": event_broker.subscriber_count()}
+
+@router.get("/startup")
+def get_startup_report():
+    """Cold-start timings of this process: imports, schema check, demo users"""
+    return startup_report.as_dict()
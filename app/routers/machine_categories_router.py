@@ -1,11 +1,13 @@
 """
 Machine Categories Router - API endpoints for machine categories
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-from ..core.database import get_db_connection
+from sqlalchemy.orm import Session
+from ..core.database import get_db
+from ..models import models_db
 
 router = APIRouter(prefix="/api/machine-categories", tags=["machine-categories"])
 
@@ -16,25 +18,16 @@ class MachineCategory(BaseModel):
     created_at: Optional[datetime] = None
 
 @router.get("", response_model=List[MachineCategory])
-async def get_machine_categories():
+def get_machine_categories(db: Session = Depends(get_db)):
     """Get all machine categories"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    categories = db.query(models_db.MachineCategory).order_by(models_db.MachineCategory.name).all()
     
-    cursor.execute("""
-        SELECT id, name, description, created_at
-        FROM machine_categories
-        ORDER BY name
-    """)
-    
-    categories = []
-    for row in cursor.fetchall():
-        categories.append({
-            "id": row[0],
-            "name": row[1],
-            "description": row[2],
-            "created_at": row[3]
-        })
-    
-    conn.close()
-    return categories
+    return [
+        {
+            "id": c.id,
+            "name": c.name,
+            "description": c.description,
+            "created_at": c.created_at
+        }
+        for c in categories
+    ]
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import List
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models.machines_model import MachineCreate, MachineUpdate
 from app.models.models_db import Machine
 from app.core.database import get_db
+from app.core.table_versions import conditional_get
+from app.core.serializers import MACHINE_COLUMNS, machine_serializer
+from app.core.responses import json_response
+from app.core.cache import response_cache, PLANNING_OVERVIEW
+from app.core.events import event_broker, machine_event
 import uuid
 
 router = APIRouter(
@@ -17,28 +22,17 @@ router = APIRouter(
 # GET ALL MACHINES
 # ----------------------------------------------------------------------
 @router.get("/", response_model=List[dict])
-async def read_machines(db: Session = Depends(get_db)):
-    machines = db.query(Machine).all()
-    return [
-        {
-            "id": m.id,
-            "name": m.name,
-            "status": m.status,
-            "hourly_rate": m.hourly_rate,
-            "last_maintenance": m.last_maintenance,
-            "current_operator": m.current_operator,
-            "updated_at": m.updated_at.isoformat() if m.updated_at else None,
-            "category_id": m.category_id,
-            "unit_id": m.unit_id,
-        }
-        for m in machines
-    ]
+def read_machines(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_get(request, response, "machines")
+    if not_modified:
+        return not_modified
+    return json_response(machine_serializer.many(db.query(*MACHINE_COLUMNS)), response)
 
 # ----------------------------------------------------------------------
 # CREATE MACHINE
 # ----------------------------------------------------------------------
 @router.post("/", response_model=dict)
-async def create_machine(machine: MachineCreate, db: Session = Depends(get_db)):
+def create_machine(machine: MachineCreate, db: Session = Depends(get_db)):
     new_machine = Machine(
         id=str(uuid.uuid4()),
         name=machine.name,
@@ -66,7 +60,7 @@ async def create_machine(machine: MachineCreate, db: Session = Depends(get_db)):
 # UPDATE MACHINE
 # ----------------------------------------------------------------------
 @router.put("/{machine_id}", response_model=dict)
-async def update_machine(machine_id: str, machine_update: MachineUpdate, db: Session = Depends(get_db)):
+def update_machine(machine_id: str, machine_update: MachineUpdate, db: Session = Depends(get_db)):
     db_machine = db.query(Machine).filter(Machine.id == machine_id).first()
     if not db_machine:
         raise HTTPException(status_code=404, detail="Machine not found")
@@ -77,8 +71,12 @@ async def update_machine(machine_id: str, machine_update: MachineUpdate, db: Ses
     
     # Always bump the updated_at timestamp
     db_machine.updated_at = datetime.utcnow()
+    events = machine_event(db_machine, "updated")
     
     db.commit()
+    # Machine names appear on the planning overview
+    response_cache.invalidate(PLANNING_OVERVIEW)
+    event_broker.publish(events)
     db.refresh(db_machine)
     
     return {
@@ -95,11 +93,14 @@ async def update_machine(machine_id: str, machine_update: MachineUpdate, db: Ses
 # DELETE MACHINE
 # ----------------------------------------------------------------------
 @router.delete("/{machine_id}")
-async def delete_machine(machine_id: str, db: Session = Depends(get_db)):
+def delete_machine(machine_id: str, db: Session = Depends(get_db)):
     db_machine = db.query(Machine).filter(Machine.id == machine_id).first()
     if not db_machine:
         raise HTTPException(status_code=404, detail="Machine not found")
     
+    events = machine_event(db_machine, "deleted")
     db.delete(db_machine)
     db.commit()
+    response_cache.invalidate(PLANNING_OVERVIEW)
+    event_broker.publish(events)
     return {"message": "Machine deleted successfully"}
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import List
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models.outsource_model import OutsourceCreate, OutsourceUpdate
 from app.models.models_db import OutsourceItem
 from app.core.database import get_db
+from app.core.table_versions import conditional_get
+from app.core.serializers import OUTSOURCE_COLUMNS, outsource_serializer
+from app.core.responses import json_response
 import uuid
 
 router = APIRouter(
@@ -17,31 +20,17 @@ router = APIRouter(
 # GET ALL OUTSOURCE ITEMS
 # ----------------------------------------------------------------------
 @router.get("/", response_model=List[dict])
-async def read_outsource_items(db: Session = Depends(get_db)):
-    items = db.query(OutsourceItem).all()
-    return [
-        {
-            "id": i.id,
-            "task_id": i.task_id,
-            "title": i.title,
-            "vendor": i.vendor,
-            "status": i.status,
-            "cost": i.cost,
-            "expected_date": i.expected_date,
-            "dc_generated": i.dc_generated,
-            "transport_status": i.transport_status,
-            "follow_up_time": i.follow_up_time.isoformat() if i.follow_up_time else None,
-            "pickup_status": i.pickup_status,
-            "updated_at": i.updated_at.isoformat() if i.updated_at else None,
-        }
-        for i in items
-    ]
+def read_outsource_items(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_get(request, response, "outsource_items")
+    if not_modified:
+        return not_modified
+    return json_response(outsource_serializer.many(db.query(*OUTSOURCE_COLUMNS)), response)
 
 # ----------------------------------------------------------------------
 # CREATE OUTSOURCE ITEM
 # ----------------------------------------------------------------------
 @router.post("/", response_model=dict)
-async def create_outsource_item(item: OutsourceCreate, db: Session = Depends(get_db)):
+def create_outsource_item(item: OutsourceCreate, db: Session = Depends(get_db)):
     new_item = OutsourceItem(
         id=str(uuid.uuid4()),
         task_id=item.task_id,
@@ -79,7 +68,7 @@ async def create_outsource_item(item: OutsourceCreate, db: Session = Depends(get
 # UPDATE OUTSOURCE ITEM
 # ----------------------------------------------------------------------
 @router.put("/{item_id}", response_model=dict)
-async def update_outsource_item(item_id: str, item_update: OutsourceUpdate, db: Session = Depends(get_db)):
+def update_outsource_item(item_id: str, item_update: OutsourceUpdate, db: Session = Depends(get_db)):
     db_item = db.query(OutsourceItem).filter(OutsourceItem.id == item_id).first()
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -113,7 +102,7 @@ async def update_outsource_item(item_id: str, item_update: OutsourceUpdate, db:
 # DELETE OUTSOURCE ITEM
 # ----------------------------------------------------------------------
 @router.delete("/{item_id}")
-async def delete_outsource_item(item_id: str, db: Session = Depends(get_db)):
+def delete_outsource_item(item_id: str, db: Session = Depends(get_db)):
     db_item = db.query(OutsourceItem).filter(OutsourceItem.id == item_id).first()
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import List
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models.planning_model import PlanningTaskCreate, PlanningTaskUpdate
 from app.models.models_db import PlanningTask
 from app.core.database import get_db
+from app.core.table_versions import conditional_get
+from app.core.serializers import PLANNING_TASK_COLUMNS, planning_task_serializer
+from app.core.responses import json_response
+from app.core.cache import response_cache, PLANNING_OVERVIEW
 import uuid
 
 router = APIRouter(
@@ -17,26 +22,17 @@ router = APIRouter(
 # GET ALL PLANNING TASKS
 # ----------------------------------------------------------------------
 @router.get("/", response_model=List[dict])
-async def read_planning_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(PlanningTask).all()
-    return [
-        {
-            "id": t.id,
-            "task_id": t.task_id,
-            "project_name": t.project_name,
-            "task_sequence": t.task_sequence,
-            "assigned_supervisor": t.assigned_supervisor,
-            "status": t.status,
-            "updated_at": t.updated_at.isoformat() if t.updated_at else None,
-        }
-        for t in tasks
-    ]
+def read_planning_tasks(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_get(request, response, "planning_tasks")
+    if not_modified:
+        return not_modified
+    return json_response(planning_task_serializer.many(db.query(*PLANNING_TASK_COLUMNS)), response)
 
 # ----------------------------------------------------------------------
 # CREATE PLANNING TASK
 # ----------------------------------------------------------------------
 @router.post("/", response_model=dict)
-async def create_planning_task(task: PlanningTaskCreate, db: Session = Depends(get_db)):
+def create_planning_task(task: PlanningTaskCreate, db: Session = Depends(get_db)):
     new_task = PlanningTask(
         id=str(uuid.uuid4()),
         task_id=task.task_id,
@@ -64,7 +60,7 @@ async def create_planning_task(task: PlanningTaskCreate, db: Session = Depends(g
 # UPDATE PLANNING TASK
 # ----------------------------------------------------------------------
 @router.put("/{task_id}", response_model=dict)
-async def update_planning_task(task_id: str, task_update: PlanningTaskUpdate, db: Session = Depends(get_db)):
+def update_planning_task(task_id: str, task_update: PlanningTaskUpdate, db: Session = Depends(get_db)):
     db_task = db.query(PlanningTask).filter(PlanningTask.id == task_id).first()
     if not db_task:
         raise HTTPException(status_code=404, detail="Planning task not found")
@@ -93,7 +89,7 @@ async def update_planning_task(task_id: str, task_update: PlanningTaskUpdate, db
 # DELETE PLANNING TASK
 # ----------------------------------------------------------------------
 @router.delete("/{task_id}")
-async def delete_planning_task(task_id: str, db: Session = Depends(get_db)):
+def delete_planning_task(task_id: str, db: Session = Depends(get_db)):
     db_task = db.query(PlanningTask).filter(PlanningTask.id == task_id).first()
     if not db_task:
         raise HTTPException(status_code=404, detail="Planning task not found")
@@ -103,71 +99,82 @@ async def delete_planning_task(task_id: str, db: Session = Depends(get_db)):
     return {"message": "Planning task deleted successfully"}
 
 @router.get("/overview")
-async def get_planning_overview(db: Session = Depends(get_db)):
-    from app.models.models_db import Task, User, Machine
+def get_planning_overview(db: Session = Depends(get_db)):
+    from app.models.models_db import Task, User, Machine, ProjectStats
     
-    # 1. Running Projects Overview
-    # Group tasks by project and calculate progress
-    projects = {}
-    tasks = db.query(Task).filter(Task.project != None).all()
+    cached = response_cache.get(PLANNING_OVERVIEW)
+    if cached is not None:
+        return cached
     
-    for task in tasks:
-        if task.project not in projects:
-            projects[task.project] = {
-                "name": task.project,
-                "total_tasks": 0,
-                "completed_tasks": 0,
-                "status": "pending" # pending, in_progress, completed
-            }
-        
-        projects[task.project]["total_tasks"] += 1
-        if task.status == "completed":
-            projects[task.project]["completed_tasks"] += 1
+    # 1. Running Projects Overview
+    # Read the per-project rollup maintained by the task endpoints
+    # (backfilled for existing tasks by migrate_add_project_stats.py)
+    stats = db.query(ProjectStats).filter(ProjectStats.total_tasks > 0).all()
     
     # Calculate status and percentage
     project_list = []
-    for p_name, p_data in projects.items():
-        if p_data["total_tasks"] > 0:
-            percentage = (p_data["completed_tasks"] / p_data["total_tasks"]) * 100
-            p_data["progress"] = round(percentage)
-            
-            if p_data["completed_tasks"] == p_data["total_tasks"]:
-                p_data["status"] = "completed"
-            elif p_data["completed_tasks"] > 0:
-                p_data["status"] = "in_progress"
-            
-            project_list.append(p_data)
+    for p_stats in stats:
+        total_tasks = p_stats.total_tasks
+        completed_tasks = p_stats.completed_tasks or 0
+        p_data = {
+            "name": p_stats.project,
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "status": "pending" # pending, in_progress, completed
+        }
+        percentage = (completed_tasks / total_tasks) * 100
+        p_data["progress"] = round(percentage)
+        
+        if completed_tasks == total_tasks:
+            p_data["status"] = "completed"
+        elif completed_tasks > 0:
+            p_data["status"] = "in_progress"
+        
+        project_list.append(p_data)
             
     # 2. Operator Working Status
-    # Get all operators and check if they have an in_progress task
-    operators = db.query(User).filter(User.role == "operator").all()
+    # One query: operators LEFT JOIN their in_progress tasks LEFT JOIN machines
+    operator_rows = db.query(
+        User.user_id,
+        User.full_name,
+        User.username,
+        Task.id,
+        Task.title,
+        Machine.name,
+    ).outerjoin(
+        Task, and_(Task.assigned_to == User.user_id, Task.status == "in_progress")
+    ).outerjoin(
+        Machine, Machine.id == Task.machine_id
+    ).filter(User.role == "operator").all()
+    
     operator_status = []
+    seen = set()
     
-    for op in operators:
-        current_task = db.query(Task).filter(
-            Task.assigned_to == op.user_id,
-            Task.status == "in_progress"
-        ).first()
+    for user_id, full_name, username, task_id, task_title, machine_name in operator_rows:
+        # An operator with several in_progress tasks yields several rows;
+        # report the first one, as before
+        if user_id in seen:
+            continue
         
         status_data = {
-            "id": op.user_id,
-            "name": op.full_name or op.username,
+            "id": user_id,
+            "name": full_name or username,
             "status": "idle",
             "current_task": None,
             "machine": None
         }
         
-        if current_task:
+        if task_id is not None:
             status_data["status"] = "working"
-            status_data["current_task"] = current_task.title
-            if current_task.machine_id:
-                machine = db.query(Machine).filter(Machine.id == current_task.machine_id).first()
-                if machine:
-                    status_data["machine"] = machine.name
+            status_data["current_task"] = task_title
+            status_data["machine"] = machine_name
         
+        seen.add(user_id)
         operator_status.append(status_data)
         
-    return {
+    result = {
         "projects": project_list,
         "operators": operator_status
     }
+    response_cache.set(result, PLANNING_OVERVIEW)
+    return result
@@ -70,7 +70,7 @@ def get_or_create_category(db: Session, category_name: str) -> MachineCategory:
 
 
 @router.post("/machines")
-async def seed_machines(
+def seed_machines(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
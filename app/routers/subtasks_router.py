@@ -35,12 +35,12 @@ class SubtaskResponse(BaseModel):
         orm_mode = True
 
 @router.get("/{task_id}", response_model=List[SubtaskResponse])
-async def get_subtasks(task_id: str, db: Session = Depends(get_db)):
+def get_subtasks(task_id: str, db: Session = Depends(get_db)):
     subtasks = db.query(Subtask).filter(Subtask.task_id == task_id).all()
     return subtasks
 
 @router.post("/", response_model=SubtaskResponse)
-async def create_subtask(
+def create_subtask(
     subtask: SubtaskCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -65,7 +65,7 @@ async def create_subtask(
     return new_subtask
 
 @router.put("/{subtask_id}", response_model=SubtaskResponse)
-async def update_subtask(
+def update_subtask(
     subtask_id: str,
     update_data: SubtaskUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -100,7 +100,7 @@ async def update_subtask(
     return subtask
 
 @router.delete("/{subtask_id}")
-async def delete_subtask(
+def delete_subtask(
     subtask_id: str,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
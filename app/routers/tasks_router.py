@@ -1,11 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional, Union
+from sqlalchemy import and_, or_, insert
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from app.models.tasks_model import TaskCreate, TaskUpdate
-from app.models.models_db import Task, TaskTimeLog
+from sqlalchemy.orm.exc import StaleDataError
+from pydantic import BaseModel, ValidationError
+from app.models.tasks_model import TaskCreate, TaskUpdate, TaskBulkCreate, TaskBatchTransition
+from app.models.models_db import Task, TaskTimeLog, TaskWorkInterval, Machine
 from app.core.database import get_db
+from app.core import project_stats
+from app.core.task_workflow import apply_transition, TransitionError
+from app.core.work_intervals import record_transitions
+from app.core.events import event_broker, task_events, bulk_task_event
+from app.core.table_versions import conditional_get
+from app.core.delta_sync import changes_since, stamp_rows
+from app.core.serializers import TASK_COLUMNS, task_serializer
+from app.core.responses import json_response
+from app.core.cache import response_cache, ANALYTICS, PLANNING_OVERVIEW
+from app.core.work_order_import import import_work_orders, iter_csv_chunks, iter_excel_chunks, DEFAULT_CHUNK_SIZE
 import uuid
+import base64
+import tempfile
 from datetime import datetime
 
 router = APIRouter(
@@ -17,52 +32,128 @@ router = APIRouter(
 class TaskActionRequest(BaseModel):
     reason: Optional[str] = None
 
-@router.get("/", response_model=List[dict])
-async def read_tasks(
-    month: Optional[int] = None,
-    year: Optional[int] = None,
+def _encode_cursor(row) -> str:
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, task_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), task_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _month_year_range(month: Optional[int], year: int):
+    """Return the half-open [start, end) datetime range for a month or a whole year."""
+    if month is None:
+        return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+@router.get("/", response_model=Union[List[dict], dict])
+def read_tasks(
+    request: Request,
+    response: Response,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=1, le=9998),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    machine_id: Optional[str] = None,
+    project: Optional[str] = None,
+    priority: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Task)
+    """
+    List tasks, optionally filtered.
+    `month`/`year` and `created_from`/`created_to` select a half-open
+    [start, end) range on created_at; when both are given they are intersected.
+    Without `limit` the full (filtered) list is returned as before. With `limit`
+    the result is a keyset page ordered newest first on (created_at, id):
+    {"items": [...], "next_cursor": ..., "total": ...}. Pass `next_cursor` back
+    as `cursor` to fetch the following page.
+    """
+    not_modified = conditional_get(request, response, "tasks")
+    if not_modified:
+        return not_modified
+    
+    query = db.query(*TASK_COLUMNS)
+    
+    # Filter by month and year if provided. Both are turned into a half-open
+    # [start, end) range on created_at so the created_at index can be used.
+    if year is not None:
+        range_start, range_end = _month_year_range(month, year)
+        created_from = max(created_from, range_start) if created_from else range_start
+        created_to = min(created_to, range_end) if created_to else range_end
+    if created_from is not None:
+        query = query.filter(Task.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(Task.created_at < created_to)
+    
+    # Server-side filters
+    if status is not None:
+        query = query.filter(Task.status == status)
+    if assigned_to is not None:
+        query = query.filter(Task.assigned_to == assigned_to)
+    if machine_id is not None:
+        query = query.filter(Task.machine_id == machine_id)
+    if project is not None:
+        query = query.filter(Task.project == project)
+    if priority is not None:
+        query = query.filter(Task.priority == priority)
+    
+    if limit is None:
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="cursor requires limit")
+        return json_response(task_serializer.many(query.all()), response)
+    
+    # Paginated mode. create_task always stamps created_at, so rows without it
+    # are legacy data that cannot take part in the keyset ordering.
+    query = query.filter(Task.created_at != None)
+    total = query.count() if include_total else None
     
-    # Filter by month and year if provided
-    if month is not None and year is not None:
-        from sqlalchemy import extract
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
         query = query.filter(
-            extract('month', Task.created_at) == month,
-            extract('year', Task.created_at) == year
+            or_(
+                Task.created_at < cursor_created_at,
+                and_(Task.created_at == cursor_created_at, Task.id < cursor_id),
+            )
         )
-    elif year is not None:
-        from sqlalchemy import extract
-        query = query.filter(extract('year', Task.created_at) == year)
-    
-    tasks = query.all()
-    return [
-        {
-            "id": t.id,
-            "title": t.title,
-            "description": t.description,
-            "project": t.project,
-            "part_item": t.part_item,
-            "nos_unit": t.nos_unit,
-            "status": t.status,
-            "priority": t.priority,
-            "assigned_by": t.assigned_by,
-            "assigned_to": t.assigned_to,
-            "machine_id": t.machine_id,
-            "due_date": t.due_date,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "started_at": t.started_at.isoformat() if t.started_at else None,
-            "completed_at": t.completed_at.isoformat() if t.completed_at else None,
-            "total_duration_seconds": t.total_duration_seconds,
-            "hold_reason": t.hold_reason,
-            "denial_reason": t.denial_reason,
-        }
-        for t in tasks
-    ]
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return json_response({
+        "items": task_serializer.many(rows),
+        "next_cursor": _encode_cursor(rows[-1]) if has_more else None,
+        "total": total,
+    }, response)
+
+@router.get("/changes", response_model=dict)
+def read_task_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """
+    Delta sync: tasks, subtasks and outsource items written after change
+    sequence `since`, plus deletes as {"entity", "id"} tombstones. Start with
+    since=0 for a full snapshot, then pass back `next_since`; repeat while
+    `has_more` is true.
+    """
+    return json_response(changes_since(db, since, limit))
 
 @router.post("/", response_model=dict)
-async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     new_task = Task(
         id=str(uuid.uuid4()),
         title=task.title,
@@ -79,7 +170,11 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
         created_at=datetime.utcnow(),
     )
     db.add(new_task)
+    project_stats.task_added(db, new_task)
+    events = task_events(db, [new_task], "created")
     db.commit()
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+    event_broker.publish(events)
     db.refresh(new_task)
     return {
         "id": new_task.id,
@@ -96,94 +191,222 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
         "due_date": new_task.due_date,
     }
 
+MAX_BULK_TASKS = 1000
+MAX_BATCH_TRANSITION = 1000
+
+@router.post("/bulk", response_model=dict)
+def create_tasks_bulk(request: TaskBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create many tasks in one transaction with a single multi-row insert.
+    Invalid items are reported by index and skipped, unless `atomic` is set,
+    in which case nothing is inserted when any item is invalid.
+    """
+    if len(request.tasks) > MAX_BULK_TASKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_TASKS} tasks per request")
+    
+    errors = []
+    valid = []
+    for index, item in enumerate(request.tasks):
+        try:
+            valid.append((index, TaskCreate(**item)))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()],
+            })
+    
+    # Check referenced machines with one query instead of failing the whole insert on the FK
+    machine_ids = {task.machine_id for _, task in valid if task.machine_id}
+    known_machines = set()
+    if machine_ids:
+        known_machines = {m_id for (m_id,) in db.query(Machine.id).filter(Machine.id.in_(machine_ids)).all()}
+    
+    rows = []
+    created = []
+    now = datetime.utcnow()
+    for index, task in valid:
+        if task.machine_id and task.machine_id not in known_machines:
+            errors.append({"index": index, "errors": [{"loc": ["machine_id"], "msg": "Machine not found"}]})
+            continue
+        row = task.dict()
+        row["id"] = str(uuid.uuid4())
+        row["created_at"] = now
+        row["total_duration_seconds"] = 0
+        rows.append(row)
+        created.append({"index": index, "id": row["id"]})
+    
+    errors.sort(key=lambda e: e["index"])
+    if request.atomic and errors:
+        raise HTTPException(status_code=400, detail={"message": "No tasks created", "errors": errors})
+    
+    if rows:
+        db.execute(insert(Task), stamp_rows(db, rows))
+        project_stats.tasks_added_bulk(db, rows)
+        db.commit()
+        response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+        event_broker.publish(bulk_task_event(len(rows)))
+    
+    return {
+        "created_count": len(created),
+        "error_count": len(errors),
+        "created": created,
+        "errors": errors,
+    }
+
+@router.post("/import", response_model=dict)
+async def import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|xlsx)$"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Import a work-order sheet (CSV or .xlsx) sent as the raw request body,
+    creating a Task and a PlanningTask per row. The body is spooled to a
+    temporary file and read in chunks; each chunk is bulk-inserted and the file
+    is committed as one transaction, so an unreadable row rejects the whole
+    import with a 400 and nothing is created.
+    `format` defaults to xlsx for spreadsheet content types, csv otherwise.
+    """
+    if format is None:
+        format = "xlsx" if "spreadsheet" in request.headers.get("content-type", "") else "csv"
+    
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as buffer:
+        async for piece in request.stream():
+            buffer.write(piece)
+        buffer.seek(0)
+        
+        try:
+            if format == "csv":
+                chunks = iter_csv_chunks(buffer, chunk_size)
+            else:
+                chunks = iter_excel_chunks(buffer, chunk_size)
+            summary = await run_in_threadpool(import_work_orders, db, chunks)
+        except (ValueError, RuntimeError) as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"Could not import file: {e}")
+        finally:
+            response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+    
+    event_broker.publish(bulk_task_event(summary["tasks_created"]))
+    return summary
+
 # Task workflow endpoints
-@router.post("/{task_id}/start")
-async def start_task(task_id: str, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+TASK_CONFLICT = "Task was modified by another request, reload and retry"
+
+def _transition_task(db: Session, task_id: str, action: str, reason: Optional[str] = None) -> Task:
+    # FOR UPDATE locks the row on PostgreSQL (SQLite ignores it); the version
+    # check in the flush catches any concurrent write that slipped through
+    task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "pending":
-        raise HTTPException(status_code=400, detail="Task must be in pending status to start")
-    task.status = "in_progress"
-    task.started_at = datetime.utcnow()
-    log = TaskTimeLog(
-        id=str(uuid.uuid4()),
-        task_id=task_id,
-        action="start",
-        timestamp=datetime.utcnow(),
-    )
-    db.add(log)
+    try:
+        result = apply_transition(task, action, reason)
+    except TransitionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        db.flush()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=TASK_CONFLICT)
+    db.add(TaskTimeLog(**result.log))
+    record_transitions(db, [(task, result)])
+    project_stats.task_transitioned(db, task, result.old_status, duration_delta=result.duration)
+    events = task_events(db, [task], action)
     db.commit()
-    return {"message": "Task started", "started_at": task.started_at.isoformat()}
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+    event_broker.publish(events)
+    return task
 
-@router.post("/{task_id}/hold")
-async def hold_task(task_id: str, request: TaskActionRequest, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "in_progress":
-        raise HTTPException(status_code=400, detail="Task must be in progress to hold")
+@router.post("/batch-transition", response_model=dict)
+def batch_transition_tasks(request: TaskBatchTransition, db: Session = Depends(get_db)):
+    """
+    Apply one workflow action (start/hold/resume/complete/deny) to many tasks in a
+    single transaction. Tasks are loaded with one query, time logs are inserted in
+    bulk and project_stats gets one update per project. Tasks that are missing or
+    in the wrong status are reported in `errors`; with `atomic` any error rejects
+    the whole batch.
+    """
+    task_ids = list(dict.fromkeys(request.task_ids))
+    if len(task_ids) > MAX_BATCH_TRANSITION:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TRANSITION} tasks per request")
     
-    # Calculate duration since start and add to total
-    if task.started_at:
-        duration = (datetime.utcnow() - task.started_at).total_seconds()
-        task.total_duration_seconds = (task.total_duration_seconds or 0) + int(duration)
+    tasks = {}
+    if task_ids:
+        tasks = {t.id: t for t in db.query(Task).filter(Task.id.in_(task_ids)).with_for_update().all()}
+    now = datetime.utcnow()
+    logs = []
+    transitions = []
+    applied = []
+    errors = []
+    # project -> [status deltas, duration delta]
+    per_project = {}
     
-    task.status = "on_hold"
-    task.hold_reason = request.reason
-    task.started_at = None  # Clear started_at when holding
+    for task_id in task_ids:
+        task = tasks.get(task_id)
+        if task is None:
+            errors.append({"task_id": task_id, "error": "Task not found"})
+            continue
+        try:
+            result = apply_transition(task, request.action, request.reason, now=now)
+        except TransitionError as e:
+            errors.append({"task_id": task_id, "error": str(e)})
+            continue
+        logs.append(result.log)
+        transitions.append((task, result))
+        applied.append(task_id)
+        if task.project:
+            deltas = per_project.setdefault(task.project, [{}, 0])
+            deltas[0][result.old_status] = deltas[0].get(result.old_status, 0) - 1
+            deltas[0][task.status] = deltas[0].get(task.status, 0) + 1
+            deltas[1] += result.duration
     
-    log = TaskTimeLog(
-        id=str(uuid.uuid4()),
-        task_id=task_id,
-        action="hold",
-        timestamp=datetime.utcnow(),
-        reason=request.reason,
-    )
-    db.add(log)
-    db.commit()
+    if request.atomic and errors:
+        db.rollback()
+        raise HTTPException(status_code=400, detail={"message": "No tasks transitioned", "errors": errors})
+    
+    if logs:
+        try:
+            db.flush()
+        except StaleDataError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail=TASK_CONFLICT)
+        db.execute(insert(TaskTimeLog), logs)
+        record_transitions(db, transitions)
+        # Sorted so concurrent batches lock project_stats rows in the same order
+        for project, (status_deltas, duration) in sorted(per_project.items()):
+            project_stats.apply_delta(db, project, status_deltas, duration_delta=duration)
+        events = task_events(db, [task for task, _ in transitions], request.action)
+        db.commit()
+        response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+        event_broker.publish(events)
+    
+    return {
+        "action": request.action,
+        "applied_count": len(applied),
+        "error_count": len(errors),
+        "applied": applied,
+        "errors": errors,
+    }
+
+@router.post("/{task_id}/start")
+def start_task(task_id: str, db: Session = Depends(get_db)):
+    task = _transition_task(db, task_id, "start")
+    return {"message": "Task started", "started_at": task.started_at.isoformat()}
+
+@router.post("/{task_id}/hold")
+def hold_task(task_id: str, request: TaskActionRequest, db: Session = Depends(get_db)):
+    _transition_task(db, task_id, "hold", request.reason)
     return {"message": "Task on hold", "reason": request.reason}
 
 @router.post("/{task_id}/resume")
-async def resume_task(task_id: str, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "on_hold":
-        raise HTTPException(status_code=400, detail="Task must be on hold to resume")
-    task.status = "in_progress"
-    task.started_at = datetime.utcnow()
-    task.hold_reason = None
-    log = TaskTimeLog(
-        id=str(uuid.uuid4()),
-        task_id=task_id,
-        action="resume",
-        timestamp=datetime.utcnow(),
-    )
-    db.add(log)
-    db.commit()
+def resume_task(task_id: str, db: Session = Depends(get_db)):
+    _transition_task(db, task_id, "resume")
     return {"message": "Task resumed"}
 
 @router.post("/{task_id}/complete")
-async def complete_task(task_id: str, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "in_progress":
-        raise HTTPException(status_code=400, detail="Task must be in progress to complete")
-    if task.started_at:
-        duration = (datetime.utcnow() - task.started_at).total_seconds()
-        task.total_duration_seconds = (task.total_duration_seconds or 0) + int(duration)
-    task.status = "completed"
-    task.completed_at = datetime.utcnow()
-    log = TaskTimeLog(
-        id=str(uuid.uuid4()),
-        task_id=task_id,
-        action="complete",
-        timestamp=datetime.utcnow(),
-    )
-    db.add(log)
-    db.commit()
+def complete_task(task_id: str, db: Session = Depends(get_db)):
+    task = _transition_task(db, task_id, "complete")
     return {
         "message": "Task completed",
         "completed_at": task.completed_at.isoformat(),
@@ -191,34 +414,33 @@ async def complete_task(task_id: str, db: Session = Depends(get_db)):
     }
 
 @router.post("/{task_id}/deny")
-async def deny_task(task_id: str, request: TaskActionRequest, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "pending":
-        raise HTTPException(status_code=400, detail="Only pending tasks can be denied")
-    task.status = "denied"
-    task.denial_reason = request.reason
-    log = TaskTimeLog(
-        id=str(uuid.uuid4()),
-        task_id=task_id,
-        action="deny",
-        timestamp=datetime.utcnow(),
-        reason=request.reason,
-    )
-    db.add(log)
-    db.commit()
+def deny_task(task_id: str, request: TaskActionRequest, db: Session = Depends(get_db)):
+    _transition_task(db, task_id, "deny", request.reason)
     return {"message": "Task denied", "reason": request.reason}
 
 @router.put("/{task_id}", response_model=dict)
-async def update_task(task_id: str, task_update: TaskUpdate, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+def update_task(task_id: str, task_update: TaskUpdate, db: Session = Depends(get_db)):
+    db_task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
     update_data = task_update.dict(exclude_unset=True)
+    old_project, old_status = db_task.project, db_task.status
     for key, value in update_data.items():
         setattr(db_task, key, value)
+    try:
+        db.flush()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=TASK_CONFLICT)
+    if (db_task.project, db_task.status) != (old_project, old_status):
+        # Move the task's contribution from its old project/status to the new one
+        duration = db_task.total_duration_seconds or 0
+        project_stats.apply_delta(db, old_project, {old_status: -1}, total_delta=-1, duration_delta=-duration)
+        project_stats.apply_delta(db, db_task.project, {db_task.status: 1}, total_delta=1, duration_delta=duration)
+    events = task_events(db, [db_task], "updated")
     db.commit()
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+    event_broker.publish(events)
     db.refresh(db_task)
     return {
         "id": db_task.id,
@@ -241,10 +463,15 @@ async def update_task(task_id: str, task_update: TaskUpdate, db: Session = Depen
     }
 
 @router.delete("/{task_id}")
-async def delete_task(task_id: str, db: Session = Depends(get_db)):
+def delete_task(task_id: str, db: Session = Depends(get_db)):
     db_task = db.query(Task).filter(Task.id == task_id).first()
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    db.query(TaskWorkInterval).filter(TaskWorkInterval.task_id == task_id).delete(synchronize_session=False)
     db.delete(db_task)
+    project_stats.task_removed(db, db_task)
+    events = task_events(db, [db_task], "deleted")
     db.commit()
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
+    event_broker.publish(events)
     return {"message": "Task deleted successfully"}
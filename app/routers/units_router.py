@@ -5,8 +5,10 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-import sqlite3
-from ..core.database import get_db_connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..core.database import get_db
+from ..models import models_db
 
 router = APIRouter(prefix="/api/units", tags=["units"])
 
@@ -20,80 +22,41 @@ class UnitCreate(BaseModel):
     name: str
     description: Optional[str] = None
 
+def _unit_to_dict(unit: models_db.Unit) -> dict:
+    return {
+        "id": unit.id,
+        "name": unit.name,
+        "description": unit.description,
+        "created_at": unit.created_at
+    }
+
 @router.get("", response_model=List[Unit])
-async def get_units():
+def get_units(db: Session = Depends(get_db)):
     """Get all units"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, name, description, created_at
-        FROM units
-        ORDER BY id
-    """)
-    
-    units = []
-    for row in cursor.fetchall():
-        units.append({
-            "id": row[0],
-            "name": row[1],
-            "description": row[2],
-            "created_at": row[3]
-        })
-    
-    conn.close()
-    return units
+    units = db.query(models_db.Unit).order_by(models_db.Unit.id).all()
+    return [_unit_to_dict(u) for u in units]
 
 @router.get("/{unit_id}", response_model=Unit)
-async def get_unit(unit_id: int):
+def get_unit(unit_id: int, db: Session = Depends(get_db)):
     """Get unit by ID"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    unit = db.query(models_db.Unit).filter(models_db.Unit.id == unit_id).first()
     
-    cursor.execute("""
-        SELECT id, name, description, created_at
-        FROM units
-        WHERE id = ?
-    """, (unit_id,))
-    
-    row = cursor.fetchone()
-    conn.close()
-    
-    if not row:
+    if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
     
-    return {
-        "id": row[0],
-        "name": row[1],
-        "description": row[2],
-        "created_at": row[3]
-    }
+    return _unit_to_dict(unit)
 
 @router.post("", response_model=Unit)
-async def create_unit(unit: UnitCreate):
+def create_unit(unit: UnitCreate, db: Session = Depends(get_db)):
     """Create new unit (admin only)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    new_unit = models_db.Unit(name=unit.name, description=unit.description)
+    db.add(new_unit)
     
     try:
-        cursor.execute("""
-            INSERT INTO units (name, description)
-            VALUES (?, ?)
-        """, (unit.name, unit.description))
-        
-        unit_id = cursor.lastrowid
-        conn.commit()
-        
-        cursor.execute("SELECT id, name, description, created_at FROM units WHERE id = ?", (unit_id,))
-        row = cursor.fetchone()
-        
-        return {
-            "id": row[0],
-            "name": row[1],
-            "description": row[2],
-            "created_at": row[3]
-        }
-    except sqlite3.IntegrityError:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Unit with this name already exists")
-    finally:
-        conn.close()
+    
+    db.refresh(new_unit)
+    return _unit_to_dict(new_unit)
@@ -1,11 +1,13 @@
 """
 User Skills Router - API endpoints for user-machine skill mapping
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-from ..core.database import get_db_connection
+from sqlalchemy.orm import Session
+from ..core.database import get_db
+from ..models import models_db
 
 router = APIRouter(prefix="/api/user-skills", tags=["user-skills"])
 
@@ -24,63 +26,59 @@ class UserMachinesBulk(BaseModel):
     machines: List[UserMachineCreate]
 
 @router.get("/{user_id}/machines", response_model=List[UserMachine])
-async def get_user_machines(user_id: str):
+def get_user_machines(user_id: str, db: Session = Depends(get_db)):
     """Get all machines a user can operate"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    skills = db.query(models_db.UserMachine).filter(models_db.UserMachine.user_id == user_id).all()
     
-    cursor.execute("""
-        SELECT id, user_id, machine_id, skill_level, created_at
-        FROM user_machines
-        WHERE user_id = ?
-    """, (user_id,))
-    
-    machines = []
-    for row in cursor.fetchall():
-        machines.append({
-            "id": row[0],
-            "user_id": row[1],
-            "machine_id": row[2],
-            "skill_level": row[3],
-            "created_at": row[4]
-        })
-    
-    conn.close()
-    return machines
+    return [
+        {
+            "id": s.id,
+            "user_id": s.user_id,
+            "machine_id": s.machine_id,
+            "skill_level": s.skill_level,
+            "created_at": s.created_at
+        }
+        for s in skills
+    ]
 
 @router.post("/{user_id}/machines")
-async def add_user_machines(user_id: str, data: UserMachinesBulk):
+def add_user_machines(user_id: str, data: UserMachinesBulk, db: Session = Depends(get_db)):
     """Add multiple machine skills for a user"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
+        # Insert or replace: update the skill level of machines the user already has
+        existing = {
+            s.machine_id: s
+            for s in db.query(models_db.UserMachine).filter(
+                models_db.UserMachine.user_id == user_id,
+                models_db.UserMachine.machine_id.in_([m.machine_id for m in data.machines])
+            ).all()
+        }
         for machine in data.machines:
-            cursor.execute("""
-                INSERT OR REPLACE INTO user_machines (user_id, machine_id, skill_level)
-                VALUES (?, ?, ?)
-            """, (user_id, machine.machine_id, machine.skill_level))
+            skill = existing.get(machine.machine_id)
+            if skill:
+                skill.skill_level = machine.skill_level
+            else:
+                skill = models_db.UserMachine(
+                    user_id=user_id,
+                    machine_id=machine.machine_id,
+                    skill_level=machine.skill_level
+                )
+                db.add(skill)
+                existing[machine.machine_id] = skill
         
-        conn.commit()
+        db.commit()
         return {"message": f"Added {len(data.machines)} machine skills for user {user_id}"}
     except Exception as e:
-        conn.rollback()
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        conn.close()
 
 @router.delete("/{user_id}/machines/{machine_id}")
-async def remove_user_machine(user_id: str, machine_id: int):
+def remove_user_machine(user_id: str, machine_id: str, db: Session = Depends(get_db)):
     """Remove a machine skill from user"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        DELETE FROM user_machines
-        WHERE user_id = ? AND machine_id = ?
-    """, (user_id, machine_id))
-    
-    conn.commit()
-    conn.close()
+    db.query(models_db.UserMachine).filter(
+        models_db.UserMachine.user_id == user_id,
+        models_db.UserMachine.machine_id == machine_id
+    ).delete(synchronize_session=False)
+    db.commit()
     
     return {"message": "Machine skill removed"}
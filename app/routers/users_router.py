@@ -1,10 +1,13 @@
 # app/routers/users_router.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlalchemy.orm import Session
 from app.models.users_model import UserCreate, UserOut, UserUpdate
 from app.core.database import get_db
+from app.core.table_versions import conditional_get
 from app.models.models_db import User
+from app.core.cache import response_cache, ANALYTICS, PLANNING_OVERVIEW
+from app.core.dependencies import invalidate_principal
 from uuid import uuid4
 import hashlib
 from datetime import datetime
@@ -16,7 +19,10 @@ router = APIRouter(prefix="/users", tags=["Users"])
 # GET ALL USERS
 # --------------------------
 @router.get("/", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db)):
+def list_users(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_get(request, response, "users")
+    if not_modified:
+        return not_modified
     users = db.query(User).all()
     return [
         UserOut(
@@ -54,6 +60,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     
     db.add(new_user)
     db.commit()
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     db.refresh(new_user)
 
     return UserOut(
@@ -77,13 +84,20 @@ def update_user_data(user_id: str, updates: UserUpdate, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="User not found")
     
     update_data = updates.dict(exclude_none=True)
+    # The principal cache is keyed by username; evict the pre-update key
+    old_username = user.username
     
     for key, value in update_data.items():
         setattr(user, key, value)
         
     user.updated_at = datetime.utcnow()
+    new_username = user.username
         
     db.commit()
+    invalidate_principal(old_username)
+    if new_username != old_username:
+        invalidate_principal(new_username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     return {"message": "User updated successfully"}
 
 
@@ -98,4 +112,6 @@ def delete_user_data(user_id: str, db: Session = Depends(get_db)):
         
     db.delete(user)
     db.commit()
+    invalidate_principal(user.username)
+    response_cache.invalidate(ANALYTICS, PLANNING_OVERVIEW)
     return {"message": "User deleted successfully"}
@@ -0,0 +1,81 @@
+"""
+Benchmark: GET /analytics query count and latency as users/tasks grow.
+
+Runs against a throwaway SQLite database (never the real workflow.db) and
+prints, for each dataset size, how many SQL statements one call issues and how
+long it takes. The query count should stay constant.
+
+Usage: python benchmark_analytics.py
+"""
+import os
+import sys
+import time
+import uuid
+import tempfile
+from datetime import datetime
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_analytics.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+from app.core.database import engine, Base, SessionLocal
+from app.models.models_db import User, Task, Attendance
+from app.core.cache import response_cache, ANALYTICS
+from app.routers.analytics_router import get_analytics
+
+SIZES = [(10, 100), (100, 1_000), (1_000, 10_000), (5_000, 50_000)]
+STATUSES = ["pending", "in_progress", "on_hold", "completed", "denied"]
+
+def seed(db, users: int, tasks: int):
+    today_str = datetime.utcnow().strftime('%Y-%m-%d')
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    db.bulk_insert_mappings(User, [
+        {"user_id": uid, "username": f"user{i}", "role": "operator", "full_name": f"User {i}"}
+        for i, uid in enumerate(user_ids)
+    ])
+    db.bulk_insert_mappings(Attendance, [
+        {"user_id": uid, "date": today_str, "status": "present"}
+        for uid in user_ids[::2]
+    ])
+    db.bulk_insert_mappings(Task, [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Task {i}",
+            "project": f"Project {i % 50}",
+            "status": STATUSES[i % len(STATUSES)],
+            "priority": "medium",
+            "assigned_to": user_ids[i % users],
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(tasks)
+    ])
+    db.commit()
+
+def main():
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    print(f"{'users':>7} {'tasks':>8} {'queries':>8} {'ms':>9}")
+    for users, tasks in SIZES:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        try:
+            seed(db, users, tasks)
+            response_cache.invalidate(ANALYTICS)
+            statements.clear()
+            start = time.perf_counter()
+            get_analytics(db=db)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"{users:>7} {tasks:>8} {len(statements):>8} {elapsed_ms:>9.1f}")
+        finally:
+            db.close()
+
+    engine.dispose()
+    os.remove(BENCH_DB)
+
+if __name__ == "__main__":
+    main()
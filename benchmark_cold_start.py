@@ -0,0 +1,70 @@
+"""
+Benchmark: cold start of the API, as reported by GET /internal/startup.
+
+Boots the app in a fresh Python process per run (imports, startup hook, first
+request) against a throwaway SQLite database and prints each startup phase:
+
+  * first boot        - empty database, tables created
+  * warm boot         - schema fingerprint matches, DDL skipped
+  * warm boot + seed  - SEED_DEMO_USERS=true (the previous always-on behaviour)
+
+Exits non-zero if a warm boot exceeds STARTUP_BUDGET_SECONDS, so it can guard
+the cold-start budget in CI.
+
+Usage: python benchmark_cold_start.py
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_cold_start.db")
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BOOT = """
+import json, sys, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    report = client.get("/internal/startup").json()
+report["process_seconds"] = round(time.perf_counter() - started, 4)
+sys.stdout.write("REPORT " + json.dumps(report) + "\\n")
+"""
+
+def boot(label: str, **env) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{BENCH_DB}", **env},
+        capture_output=True,
+        text=True,
+    )
+    lines = [line for line in result.stdout.splitlines() if line.startswith("REPORT ")]
+    if result.returncode != 0 or not lines:
+        print(f"❌ {label}: boot failed\n{result.stderr}")
+        sys.exit(1)
+    report = json.loads(lines[-1][len("REPORT "):])
+    phases = "  ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in report["phases"].items())
+    print(f"{label:<18} total {report['total_seconds'] * 1000:>6.0f}ms   {phases}")
+    return report
+
+def main():
+    if os.path.exists(BENCH_DB):
+        os.remove(BENCH_DB)
+    try:
+        boot("first boot", SEED_DEMO_USERS="false")
+        warm = boot("warm boot", SEED_DEMO_USERS="false")
+        boot("warm boot + seed", SEED_DEMO_USERS="true")
+    finally:
+        if os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    if warm["within_budget"] is False:
+        print(f"❌ warm boot over the {warm['budget_seconds']}s STARTUP_BUDGET_SECONDS budget")
+        sys.exit(1)
+    print("✅ warm boot within budget" if warm["within_budget"] else "⚠️  no startup budget set")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Load test: concurrent request throughput of sync (threadpool) vs async-def DB handlers.
+
+Starts the API with uvicorn on a throwaway SQLite database and fires
+concurrent GETs at two routes that run the same handler (read_machines):
+
+  * /machines/                 - the real route, a plain `def` that FastAPI runs
+                                 on its threadpool (current behaviour)
+  * /_bench/machines-async     - the same handler wrapped in `async def`, i.e.
+                                 blocking DB work on the event loop (previous
+                                 behaviour)
+
+SQLite on local disk answers in microseconds, so a fixed per-statement delay
+(BENCH_DB_LATENCY_MS, default 20) emulates a network round trip to hosted
+PostgreSQL.
+
+Usage: python benchmark_concurrency.py
+"""
+import os
+import sys
+import time
+import uuid
+import socket
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_concurrency.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+from fastapi import Depends, Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.main import app
+from app.core.database import engine, Base, SessionLocal, get_db
+from app.models.models_db import Machine
+from app.routers.machines_routers import read_machines
+
+DB_LATENCY_SECONDS = float(os.getenv("BENCH_DB_LATENCY_MS", "20")) / 1000
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "200"))
+# Keep at or below the connection pool capacity: with more concurrent blocking
+# async handlers than connections, the event loop can deadlock waiting for a
+# connection that only a (blocked) session teardown would release.
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "10"))
+
+@app.get("/_bench/machines-async")
+async def read_machines_on_event_loop(request: Request, response: Response, db: Session = Depends(get_db)):
+    return read_machines(request, response, db=db)
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def run(base_url: str, path: str):
+    def fetch(_):
+        with urllib.request.urlopen(base_url + path) as response:
+            response.read()
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        list(pool.map(fetch, range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    print(f"{path:<26} {REQUESTS / elapsed:>9.1f} req/s  {elapsed:>6.2f}s total")
+
+def main():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([Machine(id=str(uuid.uuid4()), name=f"Machine {i}", status="active", hourly_rate=10) for i in range(50)])
+    db.commit()
+    db.close()
+    
+    event.listen(engine, "before_cursor_execute", lambda *args: time.sleep(DB_LATENCY_SECONDS))
+    
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"{REQUESTS} requests, {CONCURRENCY} concurrent, {DB_LATENCY_SECONDS * 1000:.0f} ms per statement")
+    run(base_url, "/_bench/machines-async")
+    run(base_url, "/machines/")
+    
+    server.should_exit = True
+    thread.join()
+    engine.dispose()
+    os.remove(BENCH_DB)
+
+if __name__ == "__main__":
+    main()
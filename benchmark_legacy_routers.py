@@ -0,0 +1,102 @@
+"""
+Benchmark: per-request latency of the units/categories/skills/approvals
+endpoints, old connect-per-request sqlite3 access vs the pooled SQLAlchemy session.
+
+"before" replays what the routers used to do: sqlite3.connect(), run the
+query, close. "after" calls the current handlers with a session from the
+shared, pooled engine. Runs against a throwaway SQLite database.
+
+Opening a local SQLite file is cheap, so here the difference is mostly ORM
+overhead. Against PostgreSQL the old path could not run at all, and each new
+connection costs a network and TLS handshake that the pool avoids.
+
+Usage: python benchmark_legacy_routers.py
+"""
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import statistics
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_legacy_routers.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, Base, SessionLocal
+from app.models.models_db import Unit, MachineCategory, User, UserApproval
+from app.routers.units_router import get_units
+from app.routers.machine_categories_router import get_machine_categories
+from app.routers.approvals_router import get_pending_approvals
+
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "2000"))
+
+LEGACY_QUERIES = {
+    "units": "SELECT id, name, description, created_at FROM units ORDER BY id",
+    "machine_categories": "SELECT id, name, description, created_at FROM machine_categories ORDER BY name",
+    "pending_approvals": """
+        SELECT ua.id, ua.user_id, ua.status, ua.approved_by, ua.approved_at, ua.notes, ua.created_at,
+               u.username, u.full_name, u.email, u.date_of_birth, u.address, u.contact_number, u.unit_id
+        FROM user_approvals ua JOIN users u ON ua.user_id = u.user_id
+        WHERE ua.status = 'pending' ORDER BY ua.created_at DESC
+    """,
+}
+
+HANDLERS = {
+    "units": get_units,
+    "machine_categories": get_machine_categories,
+    "pending_approvals": get_pending_approvals,
+}
+
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([Unit(name=f"Unit {i}") for i in range(5)])
+    db.add_all([MachineCategory(name=f"Category {i}") for i in range(20)])
+    for i in range(20):
+        db.add(User(user_id=f"user-{i}", username=f"user{i}", approval_status="pending"))
+        db.add(UserApproval(user_id=f"user-{i}", status="pending"))
+    db.commit()
+    db.close()
+
+def legacy_request(sql: str):
+    conn = sqlite3.connect(BENCH_DB)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute(sql)
+    cursor.fetchall()
+    conn.close()
+
+def pooled_request(handler):
+    db = SessionLocal()
+    try:
+        handler(db=db)
+    finally:
+        db.close()
+
+def measure(fn, *args) -> list:
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+def main():
+    seed()
+    print(f"{ITERATIONS} requests per endpoint, latency in microseconds")
+    print(f"{'endpoint':<20} {'before p50':>11} {'after p50':>10} {'before p95':>11} {'after p95':>10}")
+    for name, sql in LEGACY_QUERIES.items():
+        before = measure(legacy_request, sql)
+        after = measure(pooled_request, HANDLERS[name])
+        p95 = lambda t: statistics.quantiles(t, n=20)[-1]
+        print(f"{name:<20} {statistics.median(before):>11.0f} {statistics.median(after):>10.0f} "
+              f"{p95(before):>11.0f} {p95(after):>10.0f}")
+    engine.dispose()
+    os.remove(BENCH_DB)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: payload size and latency of GET /tasks/ for 10k tasks.
+
+Runs the app in-process (TestClient) on a throwaway SQLite database and
+compares two routes returning the same list:
+
+  * /_bench/tasks-legacy  - ORM objects, hand-built dicts and response_model
+                            validation (previous behaviour)
+  * /tasks/               - column rows through the shared row serializer and
+                            FastJSONResponse (orjson when installed)
+
+each requested without compression, with gzip and, when brotli-asgi is
+installed, with brotli. Wire size is the Content-Length actually sent; the
+transfer column estimates time on a BENCH_LINK_MBPS link (default 5 Mbit/s,
+a busy shop-floor access point).
+
+Usage: python benchmark_list_payloads.py [tasks]
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from typing import List
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_list_payloads.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.main import app, BrotliMiddleware
+from app.core.database import engine, Base, SessionLocal, get_db
+from app.core.responses import orjson
+from app.models.models_db import Task
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+LINK_MBPS = float(os.getenv("BENCH_LINK_MBPS", "5"))
+
+@app.get("/_bench/tasks-legacy", response_model=List[dict])
+def read_tasks_legacy(db: Session = Depends(get_db)):
+    return [
+        {
+            "id": t.id,
+            "title": t.title,
+            "description": t.description,
+            "project": t.project,
+            "part_item": t.part_item,
+            "nos_unit": t.nos_unit,
+            "status": t.status,
+            "priority": t.priority,
+            "assigned_by": t.assigned_by,
+            "assigned_to": t.assigned_to,
+            "machine_id": t.machine_id,
+            "due_date": t.due_date,
+            "created_at": t.created_at.isoformat() if t.created_at else None,
+            "started_at": t.started_at.isoformat() if t.started_at else None,
+            "completed_at": t.completed_at.isoformat() if t.completed_at else None,
+            "total_duration_seconds": t.total_duration_seconds,
+            "hold_reason": t.hold_reason,
+            "denial_reason": t.denial_reason,
+        }
+        for t in db.query(Task).all()
+    ]
+
+def seed(db):
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    statuses = ["pending", "in_progress", "on_hold", "completed"]
+    db.bulk_insert_mappings(Task, [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Machine part {i} - {rng.choice(['shaft', 'flange', 'housing', 'bracket'])}",
+            "description": f"Turn and finish as per drawing DRG-{rng.randint(1000, 9999)}",
+            "project": f"Project {i % 40}",
+            "part_item": f"PART-{rng.randint(100, 999)}",
+            "nos_unit": str(rng.randint(1, 50)),
+            "status": rng.choice(statuses),
+            "priority": rng.choice(["low", "medium", "high"]),
+            "assigned_by": "admin",
+            "assigned_to": f"operator{i % 25}",
+            "machine_id": str(uuid.UUID(int=i % 40)),
+            "due_date": "2025-12-31",
+            "created_at": start + timedelta(minutes=i * 7),
+            "started_at": start + timedelta(minutes=i * 7 + 30),
+            "total_duration_seconds": rng.randint(0, 36000),
+        }
+        for i in range(TASKS)
+    ])
+    db.commit()
+
+def measure(client: TestClient, path: str, encoding: str):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    wire_bytes = int(response.headers["content-length"])
+    return statistics.median(timings), wire_bytes, response.json()
+
+def main():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed(db)
+    finally:
+        db.close()
+
+    encodings = ["identity", "gzip"] + (["br"] if BrotliMiddleware is not None else [])
+    print(f"{TASKS} tasks, median of {RUNS} runs, encoder: {'orjson' if orjson else 'json'}")
+    print(f"{'route':<22} {'encoding':<9} {'bytes':>11} {'latency':>10} {'transfer':>10}")
+    try:
+        with TestClient(app) as client:
+            bodies = {}
+            for path in ("/_bench/tasks-legacy", "/tasks/"):
+                for encoding in encodings:
+                    latency, wire_bytes, body = measure(client, path, encoding)
+                    bodies[path] = body
+                    transfer = wire_bytes * 8 / (LINK_MBPS * 1_000_000)
+                    print(f"{path:<22} {encoding:<9} {wire_bytes:>11,} {latency * 1000:>8.1f}ms {transfer:>9.2f}s")
+
+            # Both routes must return the same tasks
+            def by_id(rows):
+                return sorted(rows, key=lambda r: r["id"])
+            if by_id(bodies["/_bench/tasks-legacy"]) == by_id(bodies["/tasks/"]):
+                print("✅ /tasks/ matches the legacy response")
+            else:
+                print("❌ /tasks/ differs from the legacy response")
+    finally:
+        engine.dispose()
+        os.remove(BENCH_DB)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: GET /analytics/machines on a synthetic year of task time logs.
+
+Runs against a throwaway SQLite database (never the real workflow.db). Seeds
+machines, tasks and a year of start/hold/resume/complete logs, derives
+task_work_intervals with rebuild_work_intervals(), then times the pandas-based
+machine_utilization() against a plain per-row Python loop over the same rows.
+
+Usage: python benchmark_machine_utilization.py [tasks]
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "benchmark_machine_utilization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, Base, SessionLocal
+from app.models.models_db import Machine, Task, TaskTimeLog, TaskWorkInterval
+from app.core.work_intervals import rebuild_work_intervals
+from app.core.machine_utilization import machine_utilization
+
+MACHINES = 40
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+def seed(db, year_start: datetime):
+    rng = random.Random(42)
+    machine_ids = [str(uuid.uuid4()) for _ in range(MACHINES)]
+    db.bulk_insert_mappings(Machine, [
+        {"id": mid, "name": f"Machine {i}", "status": "active", "hourly_rate": float(rng.randint(200, 900))}
+        for i, mid in enumerate(machine_ids)
+    ])
+    
+    tasks, logs = [], []
+    for i in range(TASKS):
+        task_id = str(uuid.uuid4())
+        t = year_start + timedelta(minutes=rng.randint(0, 364 * 24 * 60))
+        tasks.append({
+            "id": task_id, "title": f"Task {i}", "project": f"Project {i % 30}",
+            "status": "completed", "priority": "medium",
+            "machine_id": machine_ids[i % MACHINES], "created_at": t,
+        })
+        logs.append({"id": str(uuid.uuid4()), "task_id": task_id, "action": "start", "timestamp": t})
+        # 0-3 hold/resume cycles, then complete
+        for _ in range(rng.randint(0, 3)):
+            t += timedelta(minutes=rng.randint(20, 240))
+            logs.append({"id": str(uuid.uuid4()), "task_id": task_id, "action": "hold", "timestamp": t})
+            t += timedelta(minutes=rng.randint(10, 600))
+            logs.append({"id": str(uuid.uuid4()), "task_id": task_id, "action": "resume", "timestamp": t})
+        t += timedelta(minutes=rng.randint(20, 240))
+        logs.append({"id": str(uuid.uuid4()), "task_id": task_id, "action": "complete", "timestamp": t})
+    
+    db.bulk_insert_mappings(Task, tasks)
+    db.bulk_insert_mappings(TaskTimeLog, logs)
+    db.commit()
+    return len(logs)
+
+def row_loop_utilization(db, date_from: date, date_to: date) -> dict:
+    """Baseline: the same busy/hold sums with a per-row Python loop over all intervals."""
+    range_start = datetime.combine(date_from, datetime.min.time())
+    range_end = min(datetime.combine(date_to + timedelta(days=1), datetime.min.time()), datetime.utcnow())
+    rows = db.query(
+        TaskWorkInterval.task_id, TaskWorkInterval.machine_id, TaskWorkInterval.start_at,
+        TaskWorkInterval.end_at, TaskWorkInterval.end_action,
+    ).order_by(TaskWorkInterval.task_id, TaskWorkInterval.start_at).all()
+    busy, hold = {}, {}
+    for i, (task_id, machine_id, start_at, end_at, end_action) in enumerate(rows):
+        end = min(end_at or range_end, range_end)
+        seconds = (end - max(start_at, range_start)).total_seconds()
+        if seconds > 0:
+            busy[machine_id] = busy.get(machine_id, 0) + seconds / 3600
+        if end_action == "hold":
+            following = rows[i + 1] if i + 1 < len(rows) and rows[i + 1][0] == task_id else None
+            hold_end = min(following[2] if following else range_end, range_end)
+            seconds = (hold_end - max(end_at, range_start)).total_seconds()
+            if seconds > 0:
+                hold[machine_id] = hold.get(machine_id, 0) + seconds / 3600
+    return {"busy": busy, "hold": hold}
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<38} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return result
+
+def main():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    today = datetime.utcnow().date()
+    year_start = datetime.combine(today - timedelta(days=365), datetime.min.time())
+    
+    db = SessionLocal()
+    try:
+        log_count = timed("seed", lambda: seed(db, year_start))
+        print(f"✅ {MACHINES} machines, {TASKS} tasks, {log_count} time logs")
+        intervals, _ = timed("rebuild_work_intervals", lambda: rebuild_work_intervals(db))
+        print(f"✅ {intervals} work intervals")
+        
+        import pandas  # noqa: F401  (keep the one-off import out of the timings)
+        for label, days in (("last 30 days", 30), ("full year", 365)):
+            print(f"{label}:")
+            date_from = today - timedelta(days=days - 1)
+            report = timed("machine_utilization (pandas)", lambda: machine_utilization(db, date_from, today))
+            baseline = timed("per-row loop", lambda: row_loop_utilization(db, date_from, today))
+            
+            # Both approaches should agree
+            mismatches = [
+                m["machine_id"] for m in report["machines"]
+                if abs(m["busy_hours"] - baseline["busy"].get(m["machine_id"], 0)) > 0.01
+                or abs(m["hold_hours"] - baseline["hold"].get(m["machine_id"], 0)) > 0.01
+            ]
+            if mismatches:
+                print(f"  ❌ {len(mismatches)} machines differ from the baseline")
+            else:
+                print(f"  ✅ matches baseline, total cost {report['total_cost']:,.2f}")
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(BENCH_DB)
+
+if __name__ == "__main__":
+    main()
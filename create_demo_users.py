@@ -14,6 +14,30 @@ from app.core.database import SessionLocal
 from app.models.models_db import User
 from app.core.auth_utils import hash_password
 
+def ensure_default_admin() -> bool:
+    """Create the default admin account if no admin exists. Returns True if one was created."""
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.role == "admin").first():
+            return False
+        
+        print("⚠️  No admin found! Creating default admin account...")
+        default_admin = User(
+            user_id=str(uuid.uuid4()),
+            username="admin",
+            password_hash=hash_password("admin123"),
+            email="admin@workflow.com",
+            role="admin",
+            full_name="Admin User",
+            approval_status="approved"
+        )
+        db.add(default_admin)
+        db.commit()
+        print("✅ Default admin created: admin / admin123")
+        return True
+    finally:
+        db.close()
+
 def create_demo_users():
     """Create demo users with different roles."""
     
@@ -58,23 +82,8 @@ def create_demo_users():
     db = SessionLocal()
     
     try:
-        # First, check if any admin exists
-        admin_exists = db.query(User).filter(User.role == "admin").first()
-        
-        if not admin_exists:
-            print("⚠️  No admin found! Creating default admin account...")
-            default_admin = User(
-                user_id=str(uuid.uuid4()),
-                username="admin",
-                password_hash=hash_password("admin123"),
-                email="admin@workflow.com",
-                role="admin",
-                full_name="Admin User",
-                approval_status="approved"
-            )
-            db.add(default_admin)
-            db.commit()
-            print("✅ Default admin created: admin / admin123")
+        # First, make sure an admin exists
+        ensure_default_admin()
         
         # Now create/update other demo users
         for user_data in demo_users:
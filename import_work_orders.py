@@ -0,0 +1,50 @@
+"""
+Import a work-order sheet (CSV or .xlsx) into tasks and planning tasks.
+
+Usage: python import_work_orders.py <file.csv|file.xlsx> [chunk_size]
+
+Same pipeline as POST /tasks/import: the file is streamed in chunks and each
+chunk is bulk-inserted, so large sheets load without being held in memory.
+The file is imported in one transaction: on an error nothing is created.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.core.work_order_import import import_work_orders, iter_csv_chunks, iter_excel_chunks, DEFAULT_CHUNK_SIZE
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    path = sys.argv[1]
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+    
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as f:
+            if path.lower().endswith((".xlsx", ".xlsm")):
+                chunks = iter_excel_chunks(f, chunk_size)
+            else:
+                chunks = iter_csv_chunks(f, chunk_size)
+            summary = import_work_orders(db, chunks)
+        
+        print(f"✅ Rows read: {summary['rows_read']}")
+        print(f"✅ Tasks created: {summary['tasks_created']}")
+        print(f"✅ Planning tasks created: {summary['planning_tasks_created']}")
+        if summary["error_count"]:
+            print(f"⚠️  Rows skipped: {summary['error_count']}")
+            for error in summary["errors"]:
+                print(f"   row {error['row']}: {error['error']}")
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Migration script: add delta-sync change tracking (GET /tasks/changes).
+
+Adds tasks.updated_at and change_seq on tasks, subtasks and outsource_items,
+creates the change_counters and sync_tombstones tables, and backfills every
+existing row with a change_seq so the first sync (since=0) returns it. Rows
+get consecutive sequences of at most SYNC_ROWS_PER_SEQ rows each (in id
+order), so that first sync is paged like any other. Databases backfilled by
+an earlier version of this script, with every row at change_seq = 1, are
+re-stamped the same way. Safe to run repeatedly; works on both SQLite and
+PostgreSQL.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, inspect, or_, select, text, update
+from app.core.database import engine
+from app.core.delta_sync import SYNC_ROWS_PER_SEQ, allocate_change_seqs
+from app.models.models_db import ChangeCounter, SyncTombstone, Task, Subtask, OutsourceItem
+
+NEW_COLUMNS = [
+    ("tasks", "updated_at", "TIMESTAMP"),
+    ("tasks", "change_seq", "INTEGER"),
+    ("subtasks", "change_seq", "INTEGER"),
+    ("outsource_items", "change_seq", "INTEGER"),
+]
+
+def migrate_add_change_tracking():
+    print(f"Connecting to database: {engine.url.render_as_string(hide_password=True)}")
+    
+    try:
+        inspector = inspect(engine)
+        tables = inspector.get_table_names()
+        with engine.begin() as conn:
+            for table, column, sql_type in NEW_COLUMNS:
+                if table not in tables:
+                    print(f"⚠️  {table} table does not exist, skipping")
+                    continue
+                if column in [c["name"] for c in inspector.get_columns(table)]:
+                    print(f"✅ {table}.{column} already exists")
+                    continue
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+                print(f"✅ {table}.{column} added")
+        
+        ChangeCounter.__table__.create(bind=engine, checkfirst=True)
+        SyncTombstone.__table__.create(bind=engine, checkfirst=True)
+        for model in (Task, Subtask, OutsourceItem, SyncTombstone):
+            for index in model.__table__.indexes:
+                index.create(bind=engine, checkfirst=True)
+        print("✅ change_counters, sync_tombstones and change_seq indexes ready")
+        
+        with engine.begin() as conn:
+            if "tasks" in tables:
+                conn.execute(text("UPDATE tasks SET updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)"))
+            synced = [model.__table__ for model in (Task, Subtask, OutsourceItem) if model.__tablename__ in tables]
+            # Earlier versions of this script put every existing row at sequence 1
+            legacy = sum(
+                conn.execute(select(func.count()).select_from(t).where(t.c.change_seq == 1)).scalar()
+                for t in synced
+            ) > SYNC_ROWS_PER_SEQ
+            for t in synced:
+                pending = t.c.change_seq.is_(None)
+                if legacy:
+                    pending = or_(pending, t.c.change_seq == 1)
+                ids = conn.execute(select(t.c.id).where(pending).order_by(t.c.id)).scalars().all()
+                chunks = [ids[i:i + SYNC_ROWS_PER_SEQ] for i in range(0, len(ids), SYNC_ROWS_PER_SEQ)]
+                if chunks:
+                    seq = allocate_change_seqs(conn, len(chunks))
+                    for chunk in chunks:
+                        conn.execute(update(t).where(t.c.id.in_(chunk)).values(change_seq=seq))
+                        seq += 1
+                print(f"✅ {t.name}: backfilled {len(ids)} rows")
+        print("Migration completed successfully!")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+if __name__ == "__main__":
+    migrate_add_change_tracking()
@@ -0,0 +1,30 @@
+"""
+Migration script: create the secondary indexes declared on the models.
+
+Base.metadata.create_all() only creates indexes together with new tables, so
+databases created before an index was added to models_db need this script.
+Safe to run repeatedly; works on both SQLite and PostgreSQL.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, Base
+import app.models.models_db  # noqa: F401  (registers the tables on Base)
+
+def migrate_add_indexes():
+    print(f"Connecting to database: {engine.url.render_as_string(hide_password=True)}")
+    
+    try:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+                print(f"✅ {table.name}: {index.name}")
+        print("Migration completed successfully!")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+if __name__ == "__main__":
+    migrate_add_indexes()
@@ -0,0 +1,36 @@
+"""
+Migration script: create the project_stats rollup table and backfill it from
+the tasks table (see app/core/project_stats.py).
+
+Run once when deploying the rollup. Projects are only added to the rollup by
+task writes, so without the backfill projects nobody has written to since are
+missing from GET /planning/overview. Safe to run repeatedly (it recomputes
+every row); works on both SQLite and PostgreSQL.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, engine
+from app.models.models_db import ProjectStats
+from app.core.project_stats import rebuild_project_stats
+
+def migrate_add_project_stats():
+    print(f"Connecting to database: {engine.url.render_as_string(hide_password=True)}")
+
+    db = SessionLocal()
+    try:
+        ProjectStats.__table__.create(bind=engine, checkfirst=True)
+        print("✅ project_stats table ready")
+        count = rebuild_project_stats(db)
+        print(f"✅ Backfilled project stats for {count} projects")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate_add_project_stats()
@@ -0,0 +1,34 @@
+"""
+Migration script: add the tasks.version column used for optimistic concurrency
+on task writes (see Task.__mapper_args__ in app/models/models_db.py).
+
+Existing rows start at version 1. Safe to run repeatedly; works on both SQLite
+and PostgreSQL.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app.core.database import engine
+
+def migrate_add_task_version():
+    print(f"Connecting to database: {engine.url.render_as_string(hide_password=True)}")
+    
+    try:
+        columns = [col["name"] for col in inspect(engine).get_columns("tasks")]
+        if "version" in columns:
+            print("✅ tasks.version column already exists")
+            return
+        
+        print("Adding version column to tasks table...")
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        print("✅ tasks.version column added successfully!")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+if __name__ == "__main__":
+    migrate_add_task_version()
@@ -0,0 +1,30 @@
+"""
+Rebuild the project_stats rollup from the tasks table.
+
+The rollup is maintained incrementally by the task endpoints; run this after
+editing tasks directly in the database, or whenever the counts look off.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, engine
+from app.models.models_db import ProjectStats
+from app.core.project_stats import rebuild_project_stats
+
+def main():
+    ProjectStats.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        count = rebuild_project_stats(db)
+        print(f"✅ Rebuilt project stats for {count} projects")
+    except Exception as e:
+        print(f"❌ Error rebuilding project stats: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
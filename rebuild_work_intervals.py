@@ -0,0 +1,37 @@
+"""
+Rebuild the task_work_intervals table from task_time_logs.
+
+Intervals are maintained by the task workflow endpoints; run this once after
+upgrading (to backfill history), after editing time logs directly, or when a
+task's total_duration_seconds looks off. Each logged task's
+total_duration_seconds is reset to the sum of its intervals and the
+project_stats rollup is rebuilt to match.
+"""
+import sys
+import os
+
+# Add the backend directory to the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, engine
+from app.models.models_db import TaskWorkInterval, ProjectStats
+from app.core.work_intervals import rebuild_work_intervals
+from app.core.project_stats import rebuild_project_stats
+
+def main():
+    TaskWorkInterval.__table__.create(bind=engine, checkfirst=True)
+    ProjectStats.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        intervals, tasks = rebuild_work_intervals(db)
+        print(f"✅ Rebuilt {intervals} work intervals for {tasks} tasks")
+        projects = rebuild_project_stats(db)
+        print(f"✅ Rebuilt project stats for {projects} projects")
+    except Exception as e:
+        print(f"❌ Error rebuilding work intervals: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Stress test: concurrent task transitions on SQLite, per SQLITE_PROFILE.
+
+Each writer thread drives its own tasks through start -> hold -> resume ->
+complete using the real handlers with their own sessions. A reader thread
+keeps listing machines at the same time. Every profile runs in a fresh
+subprocess against a throwaway database. The output has the number of
+"database is locked" errors and transitions per second for each profile.
+
+Usage: python stress_sqlite_writers.py [profile ...]   (default: all profiles)
+"""
+import os
+import sys
+import time
+import uuid
+import tempfile
+import threading
+import subprocess
+
+WRITERS = int(os.getenv("STRESS_WRITERS", "8"))
+TASKS_PER_WRITER = int(os.getenv("STRESS_TASKS_PER_WRITER", "25"))
+
+def run_profile():
+    # Imported here so DATABASE_URL / SQLITE_PROFILE from the parent take effect
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from sqlalchemy.exc import OperationalError
+    from app.core.database import engine, Base, SessionLocal, SQLITE_PROFILE
+    from app.models.models_db import Task, Machine
+    from app.routers.tasks_router import start_task, hold_task, resume_task, complete_task, TaskActionRequest
+    from app.routers.machines_routers import read_machines
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    task_ids = [[str(uuid.uuid4()) for _ in range(TASKS_PER_WRITER)] for _ in range(WRITERS)]
+    db.add_all([Machine(id=str(uuid.uuid4()), name=f"Machine {i}", status="active") for i in range(20)])
+    db.add_all([
+        Task(id=task_id, title="Stress task", project=f"Project {w}", status="pending", priority="medium")
+        for w, ids in enumerate(task_ids) for task_id in ids
+    ])
+    db.commit()
+    db.close()
+
+    counters = {"transitions": 0, "locked": 0, "other_errors": 0, "reads": 0}
+    lock = threading.Lock()
+    stop_reading = threading.Event()
+
+    def bump(name):
+        with lock:
+            counters[name] += 1
+
+    def call(handler, *args):
+        session = SessionLocal()
+        try:
+            handler(*args, db=session)
+            bump("transitions")
+        except OperationalError as e:
+            session.rollback()
+            bump("locked" if "locked" in str(e) else "other_errors")
+        except Exception:
+            session.rollback()
+            bump("other_errors")
+        finally:
+            session.close()
+
+    def writer(ids):
+        for task_id in ids:
+            call(start_task, task_id)
+            call(hold_task, task_id, TaskActionRequest(reason="stress"))
+            call(resume_task, task_id)
+            call(complete_task, task_id)
+
+    def reader():
+        while not stop_reading.is_set():
+            session = SessionLocal()
+            try:
+                request = Request({"type": "http", "method": "GET", "path": "/machines/", "query_string": b"", "headers": []})
+                read_machines(request, Response(), db=session)
+                bump("reads")
+            except OperationalError:
+                bump("locked")
+            finally:
+                session.close()
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=writer, args=(ids,)) for ids in task_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop_reading.set()
+    reader_thread.join()
+    engine.dispose()
+
+    print(f"{SQLITE_PROFILE:<12} {counters['transitions']:>11} {counters['locked']:>7} "
+          f"{counters['other_errors']:>7} {counters['reads']:>6} {counters['transitions'] / elapsed:>9.1f}")
+
+def main():
+    if os.getenv("STRESS_CHILD"):
+        run_profile()
+        return
+
+    profiles = sys.argv[1:] or ["default", "performance"]
+    print(f"{WRITERS} writers x {TASKS_PER_WRITER} tasks x 4 transitions, plus one reader")
+    print(f"{'profile':<12} {'transitions':>11} {'locked':>7} {'errors':>7} {'reads':>6} {'per sec':>9}")
+    for profile in profiles:
+        db_path = os.path.join(tempfile.gettempdir(), f"stress_sqlite_{profile}.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        env = dict(os.environ, STRESS_CHILD="1", SQLITE_PROFILE=profile, DATABASE_URL=f"sqlite:///{db_path}")
+        subprocess.run([sys.executable, os.path.abspath(__file__)], env=env, check=True)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()